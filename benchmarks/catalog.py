@@ -0,0 +1,189 @@
+import random
+
+IMAGE_PATH = "http://i.annihil.us/u/prod/marvel/i/mg"
+RESOURCE_PATH = "http://gateway.marvel.com/v1/public"
+NAME_PARTS = (
+    "Spider",
+    "Iron",
+    "Captain",
+    "Black",
+    "Silver",
+    "Doctor",
+    "Scarlet",
+    "Ant",
+    "Moon",
+    "Star",
+    "Night",
+    "Ghost",
+    "Thunder",
+    "Storm",
+    "Wolf",
+    "Hawk",
+    "Cosmic",
+    "Dark",
+    "Phoenix",
+    "Venom",
+    "Shadow",
+    "Frost",
+)
+NAME_SUFFIXES = (
+    "Man",
+    "Woman",
+    "Girl",
+    "Boy",
+    "Knight",
+    "Widow",
+    "Surfer",
+    "Strange",
+    "Witch",
+    "Panther",
+    "Rider",
+    "Claw",
+    "Eye",
+    "Bolt",
+    "Fist",
+    "Lord",
+)
+ROLES = ("writer", "penciller", "inker", "colorist", "letterer", "editor")
+FIRST_NAMES = ("Stan", "Jack", "Steve", "John", "Chris", "Brian", "Ed", "Mark")
+LAST_NAMES = (
+    "Lee",
+    "Kirby",
+    "Ditko",
+    "Byrne",
+    "Claremont",
+    "Bendis",
+    "Millar",
+)
+
+
+def _name(rng, i):
+    return f"{rng.choice(NAME_PARTS)}-{rng.choice(NAME_SUFFIXES)} {i}"
+
+
+def _urls(route, i):
+    return [
+        {"type": "detail", "url": f"http://marvel.com/{route}/{i}?utm_x=1"},
+        {"type": "wiki", "url": f"http://marvel.com/universe/{route}_{i}"},
+    ]
+
+
+def _thumbnail(rng):
+    if rng.random() < 0.3:
+        return {
+            "path": f"{IMAGE_PATH}/b/40/image_not_available",
+            "extension": "jpg",
+        }
+    return {
+        "path": f"{IMAGE_PATH}/{rng.randrange(16):x}/{rng.randrange(256):02x}/"
+        f"{rng.getrandbits(48):012x}",
+        "extension": "jpg",
+    }
+
+
+def _summaries(rng, route, count):
+    return {
+        "available": count,
+        "collectionURI": f"{RESOURCE_PATH}/{route}",
+        "items": [
+            {
+                "resourceURI": f"{RESOURCE_PATH}/{route}/{rng.randrange(100000)}",
+                "name": _name(rng, rng.randrange(100000)),
+            }
+            for _ in range(count)
+        ],
+        "returned": count,
+    }
+
+
+def _base(rng, route, i, name, description):
+    return {
+        "id": i,
+        "name" if route in ("characters", "events") else "title": name,
+        "description": description,
+        "modified": "2014-04-29T14:18:17-0400",
+        "thumbnail": _thumbnail(rng),
+        "resourceURI": f"{RESOURCE_PATH}/{route}/{i}",
+        "urls": _urls(route, i),
+    }
+
+
+def character(rng, i):
+    result = _base(
+        rng, "characters", i, _name(rng, i), "A hero. " * rng.randrange(0, 20)
+    )
+    result["comics"] = _summaries(rng, "comics", rng.randrange(0, 20))
+    result["stories"] = _summaries(rng, "stories", rng.randrange(0, 20))
+    return result
+
+
+def comic(rng, i, sub_items=20):
+    result = _base(
+        rng, "comics", i, f"{_name(rng, i)} (2021) #{i % 50}", "Story. " * 30
+    )
+    result["pageCount"] = rng.choice((0, 24, 32, 48))
+    result["variantDescription"] = ""
+    result["creators"] = _summaries(rng, "creators", sub_items)
+    for item in result["creators"]["items"]:
+        item["name"] = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        item["role"] = rng.choice(ROLES)
+    result["characters"] = _summaries(rng, "characters", sub_items)
+    result["stories"] = _summaries(rng, "stories", sub_items)
+    return result
+
+
+def _neighbour(rng, route):
+    if rng.random() < 0.5:
+        return None
+    return {
+        "resourceURI": f"{RESOURCE_PATH}/{route}/{rng.randrange(1000)}",
+        "name": _name(rng, rng.randrange(1000)),
+    }
+
+
+def event(rng, i):
+    result = _base(rng, "events", i, _name(rng, i), "Event. " * 10)
+    result["start"] = "1989-12-10 00:00:00"
+    result["end"] = "2008-01-04 00:00:00"
+    result["next"] = _neighbour(rng, "events")
+    result["previous"] = _neighbour(rng, "events")
+    return result
+
+
+def single_series(rng, i):
+    result = _base(rng, "series", i, f"{_name(rng, i)} (2010 - 2012)", None)
+    result["startYear"] = 2010
+    result["endYear"] = 2012
+    result["next"] = _neighbour(rng, "series")
+    result["previous"] = _neighbour(rng, "series")
+    return result
+
+
+GENERATORS = {
+    "characters": character,
+    "comics": comic,
+    "events": event,
+    "series": single_series,
+}
+SIZES = {"characters": 1560, "comics": 50000, "events": 75, "series": 13000}
+
+
+def generate(route, size=None, seed=0):
+    rng = random.Random(seed)
+    generator = GENERATORS[route]
+    return [generator(rng, i) for i in range(1, (size or SIZES[route]) + 1)]
+
+
+def page(results, offset=0, total=None, etag="synthetic"):
+    return {
+        "code": 200,
+        "status": "Ok",
+        "etag": etag,
+        "data": {
+            "offset": offset,
+            "limit": len(results),
+            "total": len(results) if total is None else total,
+            "count": len(results),
+            "results": results,
+        },
+    }
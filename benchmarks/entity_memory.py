@@ -0,0 +1,106 @@
+import gc
+import argparse
+import tracemalloc
+
+from config import Config
+from crawler import route_type
+from fetcher import Fetcher, Route
+from fetcher.entities import Entity, EntityBuilder
+from benchmarks import catalog
+
+
+class LegacyCreator:
+    def __init__(self, resource_uri, name, role):
+        self._resource_uri = resource_uri
+        self.name = name
+        self.role = role
+
+
+def _copy(value):
+    # fresh string object, as produced before interning
+    return "".join(list(value)) if isinstance(value, str) else value
+
+
+def legacy_parse(parser, results):
+    builder = EntityBuilder(Entity)
+    entities = []
+    for result in results:
+        base_features = parser.extract_base_features(result)
+        base_features["img_link"] = _copy(base_features["img_link"])
+        custom_features = parser.extract_custom_features(result)
+        if "creators" in custom_features:
+            custom_features["creators"] = [
+                LegacyCreator(
+                    _copy(creator._resource_uri),
+                    _copy(creator.name),
+                    _copy(creator.role),
+                )
+                for creator in custom_features["creators"]
+            ]
+        builder.add_base_features(base_features)
+        parser.add_custom_features(builder, custom_features)
+        entities.append(builder.finish())
+    return entities
+
+
+def compact_parse(parser, results):
+    return parser.parse(catalog.page(results)).entities
+
+
+def measure(parse, parser, results):
+    gc.collect()
+    tracemalloc.start()
+    entities = parse(parser, results)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / max(len(entities), 1)
+
+
+def load_results(config, route, synthetic):
+    if config.mirror_path and not synthetic:
+        fetcher = Fetcher(config)
+        results = list(fetcher.mirror.iter_raw(route))
+        fetcher.close()
+        if results:
+            return results
+    return catalog.generate(Fetcher.ROUTES[route], synthetic or None)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Bytes per entity with generic entities and dict-backed "
+        "creators compared to per-route slotted entities with interning"
+    )
+    parser.add_argument(
+        "routes",
+        nargs="*",
+        type=route_type,
+        help="characters, comics, events or series, all if omitted",
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="use N generated entities per route instead of MIRROR_PATH",
+    )
+    args = parser.parse_args()
+
+    config = Config()
+    for route in args.routes or list(Route):
+        entity_parser = Fetcher.LIST_PARSERS[route]
+        results = load_results(config, route, args.synthetic)
+        # warm-up, so growth of the interned strings table and other
+        # one-off allocations are not attributed to entities
+        legacy_parse(entity_parser, results)
+        compact_parse(entity_parser, results)
+        before = measure(legacy_parse, entity_parser, results)
+        after = measure(compact_parse, entity_parser, results)
+        print(
+            f"{route.name.lower():<12} entities={len(results):<7}"
+            f" before={before:8.0f}B after={after:8.0f}B"
+            f" saved={(1 - after / before) * 100:5.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import json
+import time
+import itertools
+import collections
+import threading
+
+from telegram import Bot
+from telegram.utils.request import Request
+
+
+# answers Bot API calls locally instead of sending them to Telegram
+class FakeBot(Bot):
+    def __init__(self, token="123456:fake", latency=0.0):
+        # requests never leave the process, the pool is sized only to keep
+        # Updater from warning about it
+        super().__init__(token, request=Request(con_pool_size=32))
+        self.latency = latency
+        self.calls = collections.Counter()
+        self.markups = {}
+        self._message_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _post(self, endpoint, data=None, timeout=None, api_kwargs=None):
+        data = data or {}
+        with self._lock:
+            self.calls[endpoint] += 1
+            if data.get("reply_markup"):
+                markup = data["reply_markup"]
+                if isinstance(markup, str):
+                    markup = json.loads(markup)
+                self.markups[data.get("chat_id")] = markup
+        if endpoint == "getMe":
+            return {
+                "id": 123456,
+                "is_bot": True,
+                "first_name": "Marvel",
+                "username": "marvel_bot",
+            }
+        if self.latency:
+            time.sleep(self.latency)
+        if endpoint in ("sendMessage", "sendPhoto", "editMessageText"):
+            return self._fake_message(endpoint, data)
+        return True
+
+    def _fake_message(self, endpoint, data):
+        message = {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": data.get("chat_id", 0), "type": "private"},
+            "text": data.get("text", ""),
+        }
+        if endpoint == "sendPhoto":
+            message["photo"] = [
+                {
+                    "file_id": f"photo-{message['message_id']}",
+                    "file_unique_id": f"unique-{message['message_id']}",
+                    "width": 300,
+                    "height": 450,
+                }
+            ]
+        return message
+
+
+# serves prepared updates to getUpdates after a simulated round trip
+class PollingFakeBot(FakeBot):
+    def __init__(self, updates, round_trip, batch_size=100, **kwargs):
+        super().__init__(**kwargs)
+        self.round_trip = round_trip
+        self.batch_size = batch_size
+        self._updates = updates
+
+    def _post(self, endpoint, data=None, timeout=None, api_kwargs=None):
+        if endpoint != "getUpdates":
+            return super()._post(endpoint, data, timeout, api_kwargs)
+
+        time.sleep(self.round_trip)
+        offset = data.get("offset") or 0
+        return self._updates[offset : offset + self.batch_size]
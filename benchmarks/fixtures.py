@@ -0,0 +1,154 @@
+import io
+import json
+import time
+import hashlib
+import argparse
+from urllib.parse import urlparse
+
+from config import Config
+from crawler import route_type
+from fetcher import Fetcher, Route
+from benchmarks import catalog
+
+API_PREFIX = "/v1/public/"
+MAX_LIMIT = 100
+EXACT_FILTERS = {"name": "name", "title": "title"}
+PREFIX_FILTERS = {"nameStartsWith": "name", "titleStartsWith": "title"}
+
+
+def load(path=None, routes=("characters",), size=None, seed=0):
+    if path:
+        with open(path) as fixtures:
+            return json.load(fixtures)
+    return {route: catalog.generate(route, size, seed) for route in routes}
+
+
+def respond(collections, path, params):
+    # answers a Marvel API path the way gateway.marvel.com does
+    if not path.startswith(API_PREFIX):
+        return 404, {"code": 404, "status": "Not found"}
+    route, _, _id = path[len(API_PREFIX) :].partition("/")
+    if route not in collections:
+        return 404, {"code": 404, "status": "Not found"}
+
+    results = collections[route]
+    if _id:
+        results = [result for result in results if str(result["id"]) == _id]
+        if not results:
+            return 404, {"code": 404, "status": "We couldn't find that"}
+        return 200, catalog.page(results)
+
+    for param, value in params.items():
+        value = str(value).casefold()
+        if param in EXACT_FILTERS:
+            key = EXACT_FILTERS[param]
+            results = [
+                result
+                for result in results
+                if str(result.get(key, "")).casefold() == value
+            ]
+        elif param in PREFIX_FILTERS:
+            key = PREFIX_FILTERS[param]
+            results = [
+                result
+                for result in results
+                if str(result.get(key, "")).casefold().startswith(value)
+            ]
+
+    limit = int(params.get("limit", 20))
+    offset = int(params.get("offset", 0))
+    if not 0 < limit <= MAX_LIMIT:
+        return 409, {"code": 409, "status": "Invalid limit"}
+    return 200, catalog.page(
+        results[offset : offset + limit], offset, len(results)
+    )
+
+
+class FixtureResponse:
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.raw = io.BytesIO(content)
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        pass
+
+
+# stands in for requests.Session of Fetcher, answering from fixtures
+class FixtureSession:
+    def __init__(self, collections, latency=0.0):
+        self.collections = collections
+        self.latency = latency
+        self.requests = 0
+
+    def get(self, url, params=None, headers=None, **_):
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        status_code, body = respond(
+            self.collections, urlparse(url).path, params or {}
+        )
+        content = json.dumps(body).encode("utf-8")
+        etag = hashlib.sha1(content).hexdigest()
+        if headers and headers.get("If-None-Match") == etag:
+            return FixtureResponse(304, b"", {"ETag": etag})
+        return FixtureResponse(status_code, content, {"ETag": etag})
+
+    def head(self, *_, **__):
+        return FixtureResponse(200, b"", {})
+
+    def close(self):
+        pass
+
+
+def record(fetcher, route, pages, page_size):
+    results = []
+    for page in range(pages):
+        r_json = fetcher.fetch_json(
+            route, limit=page_size, offset=page * page_size
+        )
+        results.extend(r_json["data"]["results"])
+        if len(results) >= r_json["data"]["total"]:
+            break
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record Marvel API responses as benchmark fixtures"
+    )
+    parser.add_argument("output")
+    parser.add_argument(
+        "routes",
+        nargs="*",
+        type=route_type,
+        help="characters, comics, events or series, all if omitted",
+    )
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--page-size", type=int, default=MAX_LIMIT)
+    args = parser.parse_args()
+
+    fetcher = Fetcher(Config())
+    try:
+        collections = {
+            Fetcher.ROUTES[route]: record(
+                fetcher, route, args.pages, args.page_size
+            )
+            for route in args.routes or list(Route)
+        }
+    finally:
+        fetcher.close()
+    with open(args.output, "w") as output:
+        json.dump(collections, output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+import time
+import heapq
+import random
+import argparse
+import itertools
+import threading
+
+from telegram import Update
+from telegram.ext import TypeHandler
+
+from states import States
+from fetcher import Fetcher
+from bot import make_dispatcher, register_handlers, close
+from benchmarks import catalog, standin
+from benchmarks.settings import benchmark_config
+from benchmarks.stats import summary
+from benchmarks.fake_bot import FakeBot
+from benchmarks.replay import message_update, callback_update, entity_data
+
+END = States.END.value
+# route menu, listing and search by beginning states of nested handlers
+ROUTE_STATES = (
+    (
+        States.CHARACTERS.value,
+        States.LIST_CHARACTERS.value,
+        States.FIND_CHARACTER_BY_NAME_BEGINNING.value,
+    ),
+    (
+        States.COMICS.value,
+        States.LIST_COMICS.value,
+        States.FIND_COMIC_BY_TITLE_BEGINNING.value,
+    ),
+    (
+        States.EVENTS.value,
+        States.LIST_EVENTS.value,
+        States.FIND_EVENT_BY_NAME_BEGINNING.value,
+    ),
+    (
+        States.SERIES.value,
+        States.LIST_SERIES.value,
+        States.FIND_SERIES_BY_TITLE_BEGINNING.value,
+    ),
+)
+MESSAGE = "message"
+CALLBACK = "callback"
+SELECT = "select"
+# inner conversation handlers are shared between runs, so every run gets
+# chats of its own
+_chat_ids = itertools.count(1)
+
+
+def click_script(rng):
+    menu, list_, find_beginning = rng.choice(ROUTE_STATES)
+    if rng.random() < 0.7:
+        pages = [States.NEXT_PAGE.value] * rng.randint(0, 3)
+        if pages and rng.random() < 0.5:
+            pages.append(States.PREV_PAGE.value)
+        clicks = [(CALLBACK, list_)]
+        clicks.extend((CALLBACK, page) for page in pages)
+    else:
+        name = rng.choice(catalog.NAME_PARTS)
+        clicks = [(CALLBACK, find_beginning), (MESSAGE, name)]
+    return [
+        (MESSAGE, "/start"),
+        (CALLBACK, menu),
+        *clicks,
+        (SELECT, None),
+        (CALLBACK, END),
+        (CALLBACK, END),
+    ]
+
+
+class Chat:
+    def __init__(self, chat_id, script):
+        self.chat_id = chat_id
+        self.script = script
+        self.step = 0
+
+
+class LoadGenerator:
+    def __init__(
+        self, config, chats, arrival_rate, think_time, bot_latency, seed=0
+    ):
+        self.bot = FakeBot(latency=bot_latency)
+        self.fetcher = Fetcher(config)
+        self.dispatcher = make_dispatcher(config, self.bot)
+        register_handlers(self.dispatcher, config, self.fetcher)
+        self.dispatcher.add_handler(TypeHandler(Update, self._done), group=1)
+
+        self.chats = chats
+        self.arrival_rate = arrival_rate
+        self.think_time = think_time
+        self._rng = random.Random(seed)
+        self._update_ids = itertools.count(1)
+        self._events = []
+        self._condition = threading.Condition()
+        self._in_flight = {}
+        self._finished = 0
+        self.latencies = []
+        self.queue_depth = []
+
+    def _schedule(self, at, chat):
+        with self._condition:
+            heapq.heappush(self._events, (at, chat.chat_id, chat))
+            self._condition.notify()
+
+    def _done(self, update, _):
+        # runs after the conversation handlers of the same update
+        now = time.perf_counter()
+        with self._condition:
+            chat, sent = self._in_flight.pop(update.update_id)
+            self.latencies.append(now - sent)
+        chat.step += 1
+        if chat.step < len(chat.script):
+            think = self._rng.expovariate(1 / self.think_time)
+            self._schedule(now + think, chat)
+        else:
+            with self._condition:
+                self._finished += 1
+                self._condition.notify()
+
+    def _update(self, chat):
+        while chat.step < len(chat.script):
+            kind, data = chat.script[chat.step]
+            update_id = next(self._update_ids)
+            if kind == MESSAGE:
+                return update_id, message_update(
+                    self.bot, update_id, chat.chat_id, data
+                )
+            if kind == SELECT:
+                data = entity_data(self.bot, chat.chat_id)
+                if data is None:
+                    # nothing was found, the chat goes on with the script
+                    chat.step += 1
+                    continue
+            return update_id, callback_update(
+                self.bot, update_id, chat.chat_id, data
+            )
+        return None, None
+
+    def _feed(self, deadline):
+        while True:
+            with self._condition:
+                while self._finished < self.chats and (
+                    not self._events
+                    or self._events[0][0] > time.perf_counter()
+                ):
+                    if time.perf_counter() > deadline:
+                        return
+                    timeout = 0.1
+                    if self._events:
+                        timeout = self._events[0][0] - time.perf_counter()
+                    self._condition.wait(max(min(timeout, 0.1), 0))
+                if self._finished >= self.chats:
+                    return
+                _, _, chat = heapq.heappop(self._events)
+
+            update_id, update = self._update(chat)
+            if update is None:
+                with self._condition:
+                    self._finished += 1
+                continue
+            with self._condition:
+                self._in_flight[update_id] = (chat, time.perf_counter())
+            self.dispatcher.update_queue.put(update)
+
+    def _sample(self, interval, stopped):
+        start = time.perf_counter()
+        while not stopped.wait(interval):
+            with self._condition:
+                completed = len(self.latencies)
+            # updates taken by the dispatcher still wait in chat queues
+            depth = (
+                self.dispatcher.update_queue.qsize()
+                + self.dispatcher.stats()["queued"]
+            )
+            self.queue_depth.append(
+                (time.perf_counter() - start, depth, completed)
+            )
+
+    def run(self, duration, sample_interval):
+        at = time.perf_counter()
+        for _ in range(self.chats):
+            chat = Chat(next(_chat_ids), click_script(self._rng))
+            self._schedule(at, chat)
+            at += self._rng.expovariate(self.arrival_rate)
+
+        ready = threading.Event()
+        stopped = threading.Event()
+        threads = [
+            threading.Thread(
+                target=self.dispatcher.start, kwargs={"ready": ready}
+            ),
+            threading.Thread(
+                target=self._sample, args=(sample_interval, stopped)
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+        ready.wait()
+
+        start = time.perf_counter()
+        self._feed(start + duration)
+        while self._in_flight and time.perf_counter() < start + duration:
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+
+        stopped.set()
+        self.dispatcher.stop()
+        for thread in threads:
+            thread.join()
+        close(self.dispatcher)
+        return elapsed
+
+
+def run(args, config, workers, concurrency, upstream_latency):
+    config.workers = workers
+    config.chat_concurrency = concurrency
+    # stand-in only checks that a key is sent
+    config.public_key = config.public_key or "standin"
+    config.private_key = config.private_key or "standin"
+    faults = standin.Faults(
+        upstream_latency, args.jitter, args.distribution, seed=args.seed
+    )
+    server = standin.StandIn(
+        standin.generate(tuple(catalog.GENERATORS), args.size), faults
+    )
+    server.start()
+    config.marvel_address = server.url
+    try:
+        generator = LoadGenerator(
+            config,
+            args.chats,
+            args.arrival_rate,
+            args.think_time,
+            args.bot_latency,
+            args.seed,
+        )
+        elapsed = generator.run(args.duration, args.sample_interval)
+    finally:
+        server.stop()
+    return generator, elapsed, server.stats()
+
+
+def main():
+    config = benchmark_config()
+    parser = argparse.ArgumentParser(
+        description="Simulate concurrent chats clicking through bot "
+        "handlers with fake Telegram and local Marvel API stand-in"
+    )
+    parser.add_argument("--chats", type=int, default=1000)
+    parser.add_argument(
+        "--arrival-rate",
+        type=float,
+        default=50,
+        help="new chats per second",
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=2.0,
+        help="mean seconds between a reply and the next click",
+    )
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[config.workers]
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[config.chat_concurrency],
+        help="chats handled at once, 0 handles updates one by one",
+    )
+    parser.add_argument(
+        "--upstream-latency",
+        type=float,
+        nargs="+",
+        default=[0.05],
+        help="Marvel API stand-in latency in seconds",
+    )
+    parser.add_argument("--jitter", type=float, default=0.5)
+    parser.add_argument(
+        "--distribution", choices=standin.DISTRIBUTIONS, default="lognormal"
+    )
+    parser.add_argument(
+        "--bot-latency",
+        type=float,
+        default=0.02,
+        help="simulated Bot API latency in seconds",
+    )
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=120)
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # load is limited by the bot, not by Marvel API rate limiter
+    config.quota_daily_budget = config.quota_burst = 10**9
+    config.quota_rate = 10**9
+    for workers, concurrency, upstream_latency in itertools.product(
+        args.workers, args.concurrency, args.upstream_latency
+    ):
+        generator, elapsed, upstream = run(
+            args, config, workers, concurrency, upstream_latency
+        )
+        latencies = summary(generator.latencies)
+        depths = [depth for _, depth, _ in generator.queue_depth]
+        print(
+            f"workers={workers:<3} concurrency={concurrency:<3}"
+            f" upstream={upstream_latency * 1000:.0f}ms"
+            f" updates={latencies['n']}"
+            f" throughput={latencies['n'] / elapsed:.1f}/s"
+            f" p50={latencies['p50'] * 1000:.1f}ms"
+            f" p99={latencies['p99'] * 1000:.1f}ms"
+            f" max={latencies['max'] * 1000:.1f}ms"
+            f" max_queue={max(depths, default=0)}"
+            f" upstream_requests={upstream['requests']}"
+        )
+        print(
+            "  queue depth: "
+            + " ".join(
+                f"{at:.0f}s:{depth}" for at, depth, _ in generator.queue_depth
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import time
+import argparse
+
+import requests
+
+from config import Config
+from fetcher import Fetcher, Route
+from fetcher.quota import Priority
+from benchmarks.stats import format_summary
+
+
+class UnpooledFetcher(Fetcher):
+    def make_request(self, route, priority=Priority.USER, _id=None, **kwargs):
+        path = self.ROUTES[route]
+        if _id is not None:
+            path = f"{path}/{_id}"
+
+        self.quota.acquire(priority)
+        return self.make_request_(
+            self.address,
+            path,
+            self._config.private_key,
+            self._config.public_key,
+            session=requests,
+            timeout=self._timeout,
+            **kwargs,
+        )
+
+
+def measure(fetcher, route, requests_count, limit):
+    latencies = []
+    for i in range(requests_count):
+        start = time.perf_counter()
+        fetcher.list_entities(route, limit=limit, offset=i * limit)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="p50/p99 latency of Fetcher.list_entities "
+        "with and without connection pooling"
+    )
+    parser.add_argument("-n", "--requests", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument(
+        "--route", choices=[r.name for r in Route], default="CHARACTERS"
+    )
+    args = parser.parse_args()
+
+    config = Config()
+    route = Route[args.route]
+    for name, fetcher_cls in (
+        ("unpooled", UnpooledFetcher),
+        ("pooled", Fetcher),
+    ):
+        fetcher = fetcher_cls(config)
+        latencies = measure(fetcher, route, args.requests, args.limit)
+        fetcher.close()
+        print(format_summary(name, latencies))
+
+
+if __name__ == "__main__":
+    main()
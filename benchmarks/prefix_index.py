@@ -0,0 +1,116 @@
+import time
+import argparse
+
+from config import Config
+from fetcher import Fetcher, Route
+from fetcher.prefix_index import PrefixIndex
+from benchmarks import catalog
+from benchmarks.stats import format_summary
+
+
+def load_entities(config, synthetic):
+    parser = Fetcher.LIST_PARSERS[Route.CHARACTERS]
+    if not synthetic and config.mirror_path:
+        fetcher = Fetcher(config)
+        return fetcher.build_index(Route.CHARACTERS), fetcher
+    results = catalog.generate("characters", synthetic or None)
+    parsed_entities = parser.parse(catalog.page(results))
+    return PrefixIndex(parsed_entities.entities), None
+
+
+def queries(index, count):
+    names = [
+        entity.name
+        for entity in index.list_entities(limit=len(index)).entities
+    ]
+    prefixes = sorted(
+        {name[:length] for name in names for length in (1, 2, 3, 5)}
+    )
+    return (prefixes * (count // len(prefixes) + 1))[:count]
+
+
+def measure(function, prefixes):
+    latencies = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        function(prefix)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Latency of name-beginning search with in-memory prefix "
+        "index compared to mirror and Marvel API"
+    )
+    parser.add_argument("-n", "--queries", type=int, default=10000)
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="use N generated characters instead of MIRROR_PATH",
+    )
+    parser.add_argument(
+        "--api",
+        type=int,
+        default=0,
+        help="also send N queries to Marvel API",
+    )
+    args = parser.parse_args()
+
+    config = Config()
+    start = time.perf_counter()
+    index, fetcher = load_entities(config, args.synthetic)
+    print(
+        f"index of {len(index)} characters built in "
+        f"{(time.perf_counter() - start) * 1000:.1f}ms"
+    )
+
+    prefixes = queries(index, args.queries)
+    print(
+        format_summary(
+            "prefix index",
+            measure(
+                lambda prefix: index.list_entities(
+                    limit=10, nameStartsWith=prefix
+                ),
+                prefixes,
+            ),
+        )
+    )
+    if fetcher:
+        parser_ = Fetcher.LIST_PARSERS[Route.CHARACTERS]
+        print(
+            format_summary(
+                "mirror",
+                measure(
+                    lambda prefix: fetcher.mirror.list_entities(
+                        Route.CHARACTERS,
+                        parser_,
+                        limit=10,
+                        nameStartsWith=prefix,
+                    ),
+                    prefixes[: args.queries // 10],
+                ),
+            )
+        )
+    if args.api:
+        config.cache_size = 0
+        config.serve_from_mirror = False
+        api_fetcher = Fetcher(config)
+        print(
+            format_summary(
+                "marvel api",
+                measure(
+                    lambda prefix: api_fetcher.list_entities(
+                        Route.CHARACTERS, limit=10, nameStartsWith=prefix
+                    ),
+                    prefixes[: args.api],
+                ),
+            )
+        )
+        api_fetcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+import json
+import time
+import argparse
+import itertools
+import tracemalloc
+
+from telegram import Update
+
+from states import States
+from fetcher import Fetcher
+from bot import make_dispatcher, register_handlers, close
+from visualization.custom_keyboard import CustomKeyboard
+from benchmarks import fixtures
+from benchmarks.settings import benchmark_config
+from benchmarks.stats import summary
+from benchmarks.fake_bot import FakeBot
+
+STEPS = (
+    ("start", "/start"),
+    ("characters", States.CHARACTERS.value),
+    ("list", States.LIST_CHARACTERS.value),
+    ("next", States.NEXT_PAGE.value),
+    ("prev", States.PREV_PAGE.value),
+    ("select", None),
+)
+SETTINGS = (
+    "page_window",
+    "prefetch",
+    "streaming_parse",
+    "lazy_entities",
+    "cache_size",
+    "render_cache_size",
+)
+
+
+def _user(chat_id):
+    return {"id": chat_id, "is_bot": False, "first_name": "User"}
+
+
+def message_update(bot, update_id, chat_id, text):
+    entities = []
+    if text.startswith("/"):
+        entities.append(
+            {"type": "bot_command", "offset": 0, "length": len(text)}
+        )
+    return Update.de_json(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": _user(chat_id),
+                "text": text,
+                "entities": entities,
+            },
+        },
+        bot,
+    )
+
+
+def callback_update(bot, update_id, chat_id, data):
+    return Update.de_json(
+        {
+            "update_id": update_id,
+            "callback_query": {
+                "id": str(update_id),
+                "from": _user(chat_id),
+                "chat_instance": str(chat_id),
+                "data": data,
+                "message": {
+                    "message_id": update_id,
+                    "date": int(time.time()),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "text": "",
+                },
+            },
+        },
+        bot,
+    )
+
+
+def entity_data(bot, chat_id):
+    # callback data of the first entity button shown in the chat
+    for row in bot.markups.get(chat_id, {}).get("inline_keyboard", ()):
+        for button in row:
+            data = button["callback_data"]
+            if CustomKeyboard.parse_entity_data(data):
+                return data
+    return None
+
+
+class Replay:
+    def __init__(self, config, session):
+        self.bot = FakeBot()
+        self.fetcher = Fetcher(config, session)
+        self.dispatcher = make_dispatcher(config, self.bot)
+        register_handlers(self.dispatcher, config, self.fetcher)
+        self._update_ids = itertools.count(1)
+        self._chat_ids = itertools.count(1)
+
+    def close(self):
+        close(self.dispatcher)
+
+    def conversation(self):
+        # every conversation starts in a new chat
+        chat_id = next(self._chat_ids)
+        for step, data in STEPS:
+            update_id = next(self._update_ids)
+            if step == "start":
+                update = message_update(self.bot, update_id, chat_id, data)
+            else:
+                data = data or entity_data(self.bot, chat_id)
+                if data is None:
+                    raise LookupError(f"no entity shown in chat {chat_id}")
+                update = callback_update(self.bot, update_id, chat_id, data)
+            yield step, update
+
+    def run(self, iterations, cold=False):
+        latencies = {step: [] for step, _ in STEPS}
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if cold:
+                self.fetcher.cache.clear()
+            for step, update in self.conversation():
+                step_start = time.perf_counter()
+                self.dispatcher.process_update(update)
+                latencies[step].append(time.perf_counter() - step_start)
+        elapsed = time.perf_counter() - start
+        return latencies, iterations * len(STEPS) / elapsed
+
+    def allocations(self, iterations):
+        peaks = {step: 0 for step, _ in STEPS}
+        retained = {step: 0 for step, _ in STEPS}
+        for _ in range(iterations):
+            for step, update in self.conversation():
+                # tracing starts from zero for every step, reset_peak needs
+                # python 3.9
+                tracemalloc.start()
+                self.dispatcher.process_update(update)
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                peaks[step] += peak / iterations
+                retained[step] += current / iterations
+        return peaks, retained
+
+
+def report(latencies, updates_per_second, peaks, retained, settings):
+    return {
+        "settings": settings,
+        "updates_per_second": updates_per_second,
+        "steps": {
+            step: {
+                **summary(latencies[step]),
+                "alloc_peak": peaks[step],
+                "alloc_retained": retained[step],
+            }
+            for step in latencies
+        },
+    }
+
+
+def print_report(results, baseline=None):
+    for step, stats in results["steps"].items():
+        line = (
+            f"{step:<12} n={stats['n']:<6}"
+            f" p50={stats['p50'] * 1000:9.3f}ms"
+            f" p90={stats['p90'] * 1000:9.3f}ms"
+            f" p99={stats['p99'] * 1000:9.3f}ms"
+            f" peak={stats['alloc_peak'] / 1024:9.1f}KiB"
+            f" retained={stats['alloc_retained'] / 1024:9.1f}KiB"
+        )
+        if baseline and step in baseline["steps"]:
+            line += "  p50 {:+6.1%} p99 {:+6.1%}".format(
+                *(
+                    (
+                        stats[q] / baseline["steps"][step][q] - 1
+                        if baseline["steps"][step][q]
+                        else 0.0
+                    )
+                    for q in ("p50", "p99")
+                )
+            )
+        print(line)
+
+    line = f"{'updates/s':<12} {results['updates_per_second']:9.1f}"
+    if baseline:
+        line += "  {:+6.1%}".format(
+            results["updates_per_second"] / baseline["updates_per_second"] - 1
+        )
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay /start, Characters, List, Next, Prev and entity "
+        "selection through bot handlers with fake Telegram and Marvel API"
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=200)
+    parser.add_argument(
+        "--alloc-iterations",
+        type=int,
+        default=20,
+        help="conversations replayed under tracemalloc",
+    )
+    parser.add_argument(
+        "--fixtures",
+        help="Marvel responses recorded by benchmarks.fixtures, "
+        "generated catalog if omitted",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="simulated Marvel API latency in seconds",
+    )
+    parser.add_argument(
+        "--cold",
+        action="store_true",
+        help="clear response cache before every conversation",
+    )
+    parser.add_argument("--save", help="write results as JSON baseline")
+    parser.add_argument("--compare", help="JSON baseline to compare with")
+    args = parser.parse_args()
+
+    config = benchmark_config()
+    # replay measures handlers, not the Marvel API rate limiter
+    config.quota_daily_budget = config.quota_burst = 10**9
+    config.quota_rate = 10**9
+    # every update is handled before the next one is replayed
+    config.chat_concurrency = 0
+    session = fixtures.FixtureSession(
+        fixtures.load(args.fixtures), args.latency
+    )
+    replay = Replay(config, session)
+    try:
+        latencies, updates_per_second = replay.run(args.iterations, args.cold)
+        peaks, retained = replay.allocations(args.alloc_iterations)
+    finally:
+        replay.close()
+
+    settings = {
+        "iterations": args.iterations,
+        "latency": args.latency,
+        "cold": args.cold,
+        "fixtures": args.fixtures,
+        **{name: getattr(config, name) for name in SETTINGS},
+    }
+    results = report(latencies, updates_per_second, peaks, retained, settings)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(results, baseline)
+    print(f"{'upstream':<12} {session.requests} requests")
+    if args.save:
+        with open(args.save, "w") as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import time
+import random
+import argparse
+import itertools
+
+from fetcher import Fetcher
+from bot import make_dispatcher, register_handlers, close
+from handlers.conversation_handlers import (
+    CharactersConversationHandler,
+    ComicsConversationHandler,
+    EventsConversationHandler,
+    SeriesConversationHandler,
+)
+from benchmarks import catalog, fixtures
+from benchmarks.settings import benchmark_config
+from benchmarks.stats import format_summary
+from benchmarks.fake_bot import FakeBot
+from benchmarks.load import MESSAGE, SELECT, click_script
+from benchmarks.replay import message_update, callback_update, entity_data
+
+CONVERSATION_HANDLERS = (
+    CharactersConversationHandler,
+    ComicsConversationHandler,
+    EventsConversationHandler,
+    SeriesConversationHandler,
+)
+
+
+def run(config, compiled, conversations, seed):
+    config.compiled_routing = compiled
+    # inner conversation handlers are built once per process
+    for conversation_handler in CONVERSATION_HANDLERS:
+        conversation_handler.HANDLER = None
+    bot = FakeBot()
+    session = fixtures.FixtureSession(
+        fixtures.load(routes=tuple(catalog.GENERATORS), size=200)
+    )
+    dispatcher = make_dispatcher(config, bot)
+    register_handlers(dispatcher, config, Fetcher(config, session))
+    handlers = [
+        handler
+        for group in dispatcher.groups
+        for handler in dispatcher.handlers[group]
+    ]
+
+    rng = random.Random(seed)
+    update_ids = itertools.count(1)
+    latencies = {MESSAGE: [], "callback": []}
+    for chat_id in range(1, conversations + 1):
+        for kind, data in click_script(rng):
+            update_id = next(update_ids)
+            if kind == MESSAGE:
+                update = message_update(bot, update_id, chat_id, data)
+            else:
+                if kind == SELECT:
+                    data = entity_data(bot, chat_id)
+                    if data is None:
+                        continue
+                update = callback_update(bot, update_id, chat_id, data)
+                kind = "callback"
+            # handler lookup of the dispatcher, without running the handler
+            start = time.perf_counter()
+            for handler in handlers:
+                if handler.check_update(update):
+                    break
+            latencies[kind].append(time.perf_counter() - start)
+            dispatcher.process_update(update)
+    close(dispatcher)
+    return latencies, bot.calls, bot.markups
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cost of finding the handler of an update in the "
+        "conversation tree of bot.py with per-pattern and compiled routing"
+    )
+    parser.add_argument("-n", "--conversations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = benchmark_config()
+    config.quota_daily_budget = config.quota_burst = 10**9
+    config.quota_rate = 10**9
+    config.chat_concurrency = 0
+    results = {}
+    for compiled in (False, True):
+        results[compiled] = run(
+            config, compiled, args.conversations, args.seed
+        )
+        name = "compiled" if compiled else "per-pattern"
+        for kind, latencies in results[compiled][0].items():
+            print(format_summary(f"{name} {kind}", latencies, "us", 10**6))
+
+    # both routings have to answer every update the same way
+    if results[False][1:] != results[True][1:]:
+        raise SystemExit("compiled routing answered differently")
+    print(f"{'bot api calls':<24} {sum(results[True][1].values())} identical")
+
+
+if __name__ == "__main__":
+    main()
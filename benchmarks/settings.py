@@ -0,0 +1,8 @@
+from config import Config
+
+
+def benchmark_config():
+    config = Config()
+    # every run starts without file ids sent by previous runs
+    config.file_id_cache_path = ":memory:"
+    return config
@@ -0,0 +1,275 @@
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+
+from collections import Counter, deque
+from urllib.parse import urlparse, parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks import catalog, fixtures
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+THROTTLED = {
+    "code": "RequestThrottled",
+    "message": "You have exceeded your rate limit.  Please try again later.",
+}
+INTERNAL_ERROR = {"code": 500, "status": "Internal Server Error"}
+MISSING_API_KEY = {
+    "code": "MissingParameter",
+    "message": "You must provide a user key.",
+}
+
+
+class Faults:
+    def __init__(
+        self,
+        latency=0.0,
+        jitter=0.0,
+        distribution="fixed",
+        error_rate=0.0,
+        throttle_rate=0.0,
+        max_rps=0,
+        seed=0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.distribution = distribution
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_rps = max_rps
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent = deque()
+
+    def delay(self):
+        with self._lock:
+            if self.distribution == "uniform":
+                delay = self._rng.uniform(
+                    self.latency - self.jitter, self.latency + self.jitter
+                )
+            elif self.distribution == "normal":
+                delay = self._rng.gauss(self.latency, self.jitter)
+            elif self.distribution == "lognormal":
+                # latency is the median, jitter is sigma of its logarithm
+                delay = self.latency * self._rng.lognormvariate(0, self.jitter)
+            elif self.distribution == "exponential" and self.latency:
+                delay = self._rng.expovariate(1 / self.latency)
+            else:
+                delay = self.latency
+        return max(delay, 0.0)
+
+    def fault(self):
+        now = time.monotonic()
+        with self._lock:
+            if self.max_rps:
+                while self._recent and self._recent[0] <= now - 1:
+                    self._recent.popleft()
+                if len(self._recent) >= self.max_rps:
+                    return 429, THROTTLED
+                self._recent.append(now)
+            draw = self._rng.random()
+        if draw < self.throttle_rate:
+            return 429, THROTTLED
+        if draw < self.throttle_rate + self.error_rate:
+            return 500, INTERNAL_ERROR
+        return None
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    request_queue_size = 128
+    daemon_threads = True
+
+
+# serves generated catalog at /v1/public/{route} like gateway.marvel.com
+class StandIn:
+    def __init__(self, collections, faults=None, host="127.0.0.1", port=0):
+        self.collections = collections
+        self.faults = faults or Faults()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self._statuses = Counter()
+        self._httpd = _HTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = dict(parse_qsl(url.query))
+                status_code, body, headers = standin.handle(
+                    url.path, params, self.headers.get("If-None-Match")
+                )
+                self.send_response(status_code)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def handle(self, path, params, if_none_match=None):
+        headers = {"Content-Type": "application/json"}
+        if path == "/stats":
+            return 200, json.dumps(self.stats()).encode("utf-8"), headers
+
+        time.sleep(self.faults.delay())
+        if "apikey" not in params:
+            status_code, body = 409, MISSING_API_KEY
+        else:
+            status_code, body = self.faults.fault() or fixtures.respond(
+                self.collections, path, params
+            )
+
+        content = json.dumps(body).encode("utf-8")
+        if status_code == 200:
+            etag = hashlib.sha1(content).hexdigest()
+            headers["ETag"] = etag
+            if if_none_match == etag:
+                status_code, content = 304, b""
+        with self._lock:
+            self.requests += 1
+            self._statuses[status_code] += 1
+        return status_code, content, headers
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.start()
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        if self._thread:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "statuses": {
+                    str(status): count
+                    for status, count in sorted(self._statuses.items())
+                },
+            }
+
+
+def generate(routes, size, description_bytes=None, seed=0):
+    collections = {}
+    for route in routes:
+        results = catalog.generate(
+            route, min(size, catalog.SIZES[route]), seed
+        )
+        if description_bytes is not None:
+            for result in results:
+                result["description"] = "x" * description_bytes
+        collections[route] = results
+    return collections
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Local stand-in of Marvel API over generated catalog, "
+        "point MARVEL_ADDRESS at it"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--routes",
+        nargs="*",
+        choices=tuple(catalog.GENERATORS),
+        help="all routes if omitted",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=2000,
+        help="maximum number of entities per route",
+    )
+    parser.add_argument(
+        "--description-bytes",
+        type=int,
+        help="description length of every entity to control payload size",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per response"
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.0,
+        help="spread of latency: half width of uniform, standard deviation "
+        "of normal or sigma of lognormal distribution",
+    )
+    parser.add_argument(
+        "--distribution", choices=DISTRIBUTIONS, default="fixed"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="share of 500 answers"
+    )
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="share of 429 answers",
+    )
+    parser.add_argument(
+        "--max-rps",
+        type=int,
+        default=0,
+        help="answer 429 above this many requests per second",
+    )
+    args = parser.parse_args()
+
+    faults = Faults(
+        args.latency,
+        args.jitter,
+        args.distribution,
+        args.error_rate,
+        args.throttle_rate,
+        args.max_rps,
+        args.seed,
+    )
+    collections = generate(
+        args.routes or tuple(catalog.GENERATORS),
+        args.size,
+        args.description_bytes,
+        args.seed,
+    )
+    standin = StandIn(collections, faults, args.host, args.port)
+    print(f"serving {standin.url}", flush=True)
+    try:
+        standin.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.stop()
+    print(json.dumps(standin.stats()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import math
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(math.ceil(q / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def summary(values):
+    return {
+        "n": len(values),
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0,
+    }
+
+
+def format_summary(name, values, unit="ms", scale=1000):
+    stats = summary(values)
+    return (
+        f"{name:<24} n={stats['n']:<6}"
+        f" p50={stats['p50'] * scale:9.3f}{unit}"
+        f" p90={stats['p90'] * scale:9.3f}{unit}"
+        f" p99={stats['p99'] * scale:9.3f}{unit}"
+        f" max={stats['max'] * scale:9.3f}{unit}"
+    )
@@ -0,0 +1,72 @@
+import io
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+from fetcher import Fetcher, Route
+from benchmarks import catalog
+from benchmarks.stats import format_summary
+
+
+def comics_page(items, sub_items, seed):
+    rng = random.Random(seed)
+    results = [catalog.comic(rng, i, sub_items) for i in range(items)]
+    return json.dumps(catalog.page(results)).encode("utf-8")
+
+
+def parse_tree(parser, body):
+    return parser.parse(json.loads(body))
+
+
+def parse_stream(parser, body):
+    return parser.parse_stream(io.BytesIO(body))
+
+
+def measure(function, parser, body, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(parser, body)
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function(parser, body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return latencies, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parse time and peak memory of 100-item comics pages "
+        "decoded as a whole and with streaming field-selective parser"
+    )
+    parser.add_argument("-n", "--repeat", type=int, default=20)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument(
+        "--sub-items",
+        type=int,
+        default=20,
+        help="creators, characters and stories per comic",
+    )
+    args = parser.parse_args()
+
+    body = comics_page(args.items, args.sub_items, seed=0)
+    comic_parser = Fetcher.LIST_PARSERS[Route.COMICS]
+    assert [e.name for e in parse_tree(comic_parser, body).entities] == [
+        e.name for e in parse_stream(comic_parser, body).entities
+    ]
+
+    print(f"page of {args.items} comics, {len(body) / 1024:.0f}KiB")
+    for name, function in (
+        ("json.loads + parse", parse_tree),
+        ("parse_stream", parse_stream),
+    ):
+        latencies, peak = measure(function, comic_parser, body, args.repeat)
+        print(f"{format_summary(name, latencies)} peak={peak / 1024:.0f}KiB")
+
+
+if __name__ == "__main__":
+    main()
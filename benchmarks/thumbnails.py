@@ -0,0 +1,103 @@
+import time
+import argparse
+
+import requests
+from telegram import Bot
+
+from config import Config
+from visualization.thumbnails import Thumbnails
+from benchmarks.stats import format_summary
+
+# sample character thumbnails returned by Marvel API
+IMG_LINKS = (
+    "http://i.annihil.us/u/prod/marvel/i/mg/c/e0/535fecbbb9784.jpg",
+    "http://i.annihil.us/u/prod/marvel/i/mg/3/20/5232158de5b16.jpg",
+    "http://i.annihil.us/u/prod/marvel/i/mg/9/50/4ce18691cbf04.jpg",
+    "http://i.annihil.us/u/prod/marvel/i/mg/1/b0/5269678709fb7.jpg",
+    "http://i.annihil.us/u/prod/marvel/i/mg/5/a0/538615ca33ab0.jpg",
+)
+VARIANTS = ("", "detail", "portrait_incredible", "portrait_uncanny")
+
+
+def measure_downloads(session, urls, repeat, timeout):
+    latencies = []
+    sizes = []
+    for _ in range(repeat):
+        for url in urls:
+            start = time.perf_counter()
+            response = session.get(url, timeout=timeout)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+            sizes.append(len(response.content))
+    return latencies, sizes
+
+
+def measure_sends(bot, chat_id, urls, contents):
+    # time-to-photo of the three ways BaseDisplay.send_photo may send it
+    latencies = {"url": [], "file_id": [], "upload": []}
+
+    def send(mode, photo):
+        start = time.perf_counter()
+        message = bot.send_photo(chat_id, photo)
+        latencies[mode].append(time.perf_counter() - start)
+        bot.delete_message(chat_id, message.message_id)
+        return message
+
+    for url, content in zip(urls, contents):
+        # the url send gives the file id sent again
+        file_id = send("url", url).photo[-1].file_id
+        send("file_id", file_id)
+        send("upload", content)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="bytes transferred and time-to-photo of Marvel "
+        "thumbnail variants"
+    )
+    parser.add_argument("img_links", nargs="*", default=IMG_LINKS)
+    parser.add_argument(
+        "--variants",
+        nargs="*",
+        default=VARIANTS,
+        help="image variants, empty string for the original",
+    )
+    parser.add_argument("-n", "--repeat", type=int, default=3)
+    parser.add_argument(
+        "--chat-id",
+        type=int,
+        help="also send photos to this chat with BOT_TOKEN",
+    )
+    args = parser.parse_args()
+
+    config = Config()
+    timeout = (config.connect_timeout, config.read_timeout)
+    bot = Bot(config.bot_token) if args.chat_id else None
+    session = requests.Session()
+    for variant in args.variants:
+        name = variant or "original"
+        urls = [
+            Thumbnails.variant_url(img_link, variant)
+            for img_link in args.img_links
+        ]
+        latencies, sizes = measure_downloads(
+            session, urls, args.repeat, timeout
+        )
+        print(
+            format_summary(f"{name} download", latencies),
+            f"avg={sum(sizes) / len(sizes) / 1024:.1f}KiB",
+        )
+        if bot is None:
+            continue
+
+        contents = [session.get(url, timeout=timeout).content for url in urls]
+        for mode, mode_latencies in measure_sends(
+            bot, args.chat_id, urls, contents
+        ).items():
+            print(format_summary(f"{name} {mode}", mode_latencies))
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import json
+import time
+import argparse
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from telegram import Update
+from telegram.ext import Updater, TypeHandler
+
+from fetcher import Fetcher
+from webhook import WebhookServer
+from bot import make_dispatcher, register_handlers, close
+from benchmarks.settings import benchmark_config
+from benchmarks.stats import format_summary
+from benchmarks.fake_bot import FakeBot, PollingFakeBot
+
+SECRET = "benchmark-secret"
+
+
+class Counter:
+    def __init__(self, target):
+        self.target = target
+        self.count = 0
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+
+    def update(self, *_):
+        with self._lock:
+            self.count += 1
+            if self.count >= self.target:
+                self.done.set()
+
+
+def make_update(update_id, chat_id):
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "User"},
+            "text": "/start",
+            "entities": [{"type": "bot_command", "offset": 0, "length": 6}],
+        },
+    }
+
+
+def make_updates(count, chats, first_chat):
+    return [
+        make_update(update_id, first_chat + update_id % chats)
+        for update_id in range(count)
+    ]
+
+
+def prepare(config, bot, count):
+    dispatcher = make_dispatcher(config, bot)
+    register_handlers(dispatcher, config, Fetcher(config))
+    counter = Counter(count)
+    dispatcher.add_handler(TypeHandler(Update, counter.update), group=1)
+    return dispatcher, counter
+
+
+def run_polling(config, updates, round_trip, bot_latency):
+    bot = PollingFakeBot(updates, round_trip, latency=bot_latency)
+    dispatcher, counter = prepare(config, bot, len(updates))
+    updater = Updater(dispatcher=dispatcher, workers=None)
+
+    start = time.perf_counter()
+    updater.start_polling(poll_interval=0)
+    counter.done.wait()
+    elapsed = time.perf_counter() - start
+    updater.stop()
+    close(dispatcher)
+    return elapsed
+
+
+def run_webhook(config, updates, clients, bot_latency):
+    bot = FakeBot(latency=bot_latency)
+    dispatcher, counter = prepare(config, bot, len(updates))
+    server = WebhookServer(dispatcher, "127.0.0.1", 0, "/webhook", SECRET)
+    server.start()
+    url = "http://{}:{}/webhook".format(*server.address)
+    local = threading.local()
+
+    def post(update):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        body = json.dumps(update)
+        headers = {WebhookServer.SECRET_HEADER: SECRET}
+        start = time.perf_counter()
+        # telegram retries updates answered with 503
+        while (
+            local.session.post(url, body, headers=headers).status_code == 503
+        ):
+            time.sleep(0.01)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        latencies = list(executor.map(post, updates))
+    counter.done.wait()
+    elapsed = time.perf_counter() - start
+    stats = server.stats()
+    server.stop()
+    close(dispatcher)
+    return elapsed, latencies, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="throughput of webhook and polling update ingestion"
+    )
+    parser.add_argument("-n", "--updates", type=int, default=2000)
+    parser.add_argument("--chats", type=int, default=100)
+    parser.add_argument(
+        "--round-trip",
+        type=float,
+        default=0.05,
+        help="simulated getUpdates round trip in seconds",
+    )
+    parser.add_argument(
+        "--bot-latency",
+        type=float,
+        default=0.0,
+        help="simulated latency of other Bot API calls in seconds",
+    )
+    parser.add_argument(
+        "--clients",
+        type=int,
+        default=40,
+        help="concurrent webhook connections, 40 is Telegram default",
+    )
+    args = parser.parse_args()
+
+    config = benchmark_config()
+    elapsed = run_polling(
+        config,
+        make_updates(args.updates, args.chats, 1),
+        args.round_trip,
+        args.bot_latency,
+    )
+    print(f"{'polling':<24} {args.updates / elapsed:9.1f} updates/s")
+
+    elapsed, latencies, stats = run_webhook(
+        config,
+        make_updates(args.updates, args.chats, 1 + args.chats),
+        args.clients,
+        args.bot_latency,
+    )
+    print(f"{'webhook':<24} {args.updates / elapsed:9.1f} updates/s")
+    print(format_summary("webhook post", latencies))
+    print(f"{'webhook 503':<24} {stats['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
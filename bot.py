@@ -1,5 +1,15 @@
+import sys
+import threading
+
+from queue import Queue
+from urllib.parse import urlparse
+
+from telegram import Bot
+from telegram.utils.request import Request
 from telegram.ext import (
+    Filters,
     Updater,
+    JobQueue,
     CommandHandler,
     ConversationHandler,
     CallbackQueryHandler,
@@ -7,10 +17,31 @@ from telegram.ext import (
 
 from config import Config
 from states import States
-from fetcher import Fetcher
-from constants import FETCHER
+from webhook import WebhookServer
+from chat_dispatcher import ChatDispatcher
+from fetcher import Fetcher, AsyncFetcher, SyncFetcher
+from constants import (
+    FETCHER,
+    FILE_IDS,
+    THUMBNAILS,
+    RENDERS,
+    CAPTIONS,
+    WEBHOOK,
+    DISPATCHER,
+)
 from handlers.entity_handlers import MiscHandler
+from visualization.file_id_cache import FileIdCache
+from visualization.thumbnails import Thumbnails
+from visualization.render_cache import RenderCache
+from visualization.caption_cache import CaptionCache
+from visualization.display import (
+    CharactersDisplay,
+    ComicsDisplay,
+    EventsDisplay,
+    SeriesDisplay,
+)
 from handlers.conversation_handlers import (
+    ConversationHandlerBuilder,
     CharactersConversationHandler,
     ComicsConversationHandler,
     EventsConversationHandler,
@@ -18,11 +49,43 @@ from handlers.conversation_handlers import (
 )
 
 
-def main(bot_token, fetcher) -> None:
-    updater = Updater(bot_token)
-    dispatcher = updater.dispatcher
+def make_dispatcher(config, bot=None):
+    if bot is None:
+        # workers, chat threads, dispatcher, updater, job queue and main
+        # thread
+        request = Request(
+            con_pool_size=config.workers + config.chat_concurrency + 4
+        )
+        bot = Bot(config.bot_token, request=request)
+    job_queue = JobQueue()
+    dispatcher = ChatDispatcher(
+        bot,
+        Queue(config.update_queue_size),
+        workers=config.workers,
+        job_queue=job_queue,
+        concurrency=config.chat_concurrency,
+        chat_queue_size=config.chat_queue_size,
+    )
+    job_queue.set_dispatcher(dispatcher)
+    dispatcher.bot_data[DISPATCHER] = dispatcher
+    return dispatcher
+
+
+def register_handlers(dispatcher, config, fetcher):
     dispatcher.bot_data[FETCHER] = fetcher
+    dispatcher.bot_data[FILE_IDS] = FileIdCache(
+        config.file_id_cache_path, config.file_id_cache_size
+    )
+    dispatcher.bot_data[THUMBNAILS] = Thumbnails(
+        config.thumbnail_variant,
+        config.thumbnail_cache_path,
+        config.thumbnail_cache_max_bytes,
+        (config.connect_timeout, config.read_timeout),
+    )
+    dispatcher.bot_data[RENDERS] = RenderCache(config.render_cache_size)
+    dispatcher.bot_data[CAPTIONS] = CaptionCache(config.caption_cache_size)
 
+    ConversationHandlerBuilder.COMPILED_ROUTING = config.compiled_routing
     characters_handler = CharactersConversationHandler.get()
     comics_handler = ComicsConversationHandler.get()
     events_handler = EventsConversationHandler.get()
@@ -49,11 +112,80 @@ def main(bot_token, fetcher) -> None:
         ],
     )
     dispatcher.add_handler(conversation_handler)
-    updater.start_polling()
-    updater.idle()
+    dispatcher.add_handler(
+        CommandHandler(
+            "stats",
+            MiscHandler.stats,
+            filters=Filters.user(user_id=config.admin_ids),
+        )
+    )
+
+
+def warm_captions(fetcher, captions):
+    # captions of indexed catalog are rendered before anyone opens them
+    fetcher.indexed.wait()
+    for display in (
+        CharactersDisplay,
+        ComicsDisplay,
+        EventsDisplay,
+        SeriesDisplay,
+    ):
+        for entity in fetcher.index(display.ROUTE) or ():
+            if captions.full():
+                return
+            display.caption(captions, entity)
+
+
+def close(dispatcher):
+    for key in (FETCHER, FILE_IDS, THUMBNAILS):
+        dispatcher.bot_data[key].close()
+
+
+def main(config, fetcher) -> None:
+    dispatcher = make_dispatcher(config)
+    register_handlers(dispatcher, config, fetcher)
+    if config.caption_warm_up:
+        # only the local mirror is warmed, never the Marvel API quota
+        if (
+            getattr(fetcher, "mirror", None)
+            and config.serve_from_mirror
+            and config.prefix_index
+        ):
+            threading.Thread(
+                target=warm_captions,
+                args=(fetcher, dispatcher.bot_data[CAPTIONS]),
+                daemon=True,
+            ).start()
+        else:
+            print(
+                "Caption warm-up skipped, it needs MIRROR_PATH, "
+                "SERVE_FROM_MIRROR and PREFIX_INDEX",
+                file=sys.stderr,
+            )
+
+    if config.webhook_url:
+        server = WebhookServer(
+            dispatcher,
+            config.webhook_listen,
+            config.webhook_port,
+            urlparse(config.webhook_url).path,
+            config.webhook_secret,
+            config.webhook_cert,
+            config.webhook_key,
+        )
+        dispatcher.bot_data[WEBHOOK] = server
+        server.serve(config.webhook_url)
+    else:
+        updater = Updater(dispatcher=dispatcher, workers=None)
+        updater.start_polling()
+        updater.idle()
+    close(dispatcher)
 
 
 if __name__ == "__main__":
     config = Config()
-    fetcher_ = Fetcher(config)
-    main(config.bot_token, fetcher_)
+    if config.async_fetcher:
+        fetcher_ = SyncFetcher(AsyncFetcher(config), config)
+    else:
+        fetcher_ = Fetcher(config)
+    main(config, fetcher_)
@@ -0,0 +1,106 @@
+import sys
+import threading
+import traceback
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from telegram import Update
+from telegram.ext import Dispatcher
+
+
+# handlers of different chats run concurrently on a thread pool, updates of
+# one chat are queued and handled one after another in arrival order, so
+# conversation state and chat_data are never touched by two threads at once
+class ChatDispatcher(Dispatcher):
+    def __init__(
+        self, *args, concurrency=0, chat_queue_size=10, max_queued=0, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.concurrency = concurrency
+        self.chat_queue_size = max(chat_queue_size, 1)
+        self.max_queued = max_queued or concurrency * self.chat_queue_size
+        self._executor = None
+        if concurrency:
+            self._executor = ThreadPoolExecutor(
+                concurrency, thread_name_prefix="chat"
+            )
+        self._condition = threading.Condition()
+        # chat id -> updates waiting for the chat, present while the chat
+        # is being drained by a pool thread
+        self._chats = {}
+        self._queued = 0
+
+        self.processed = 0
+        self.waits = 0
+        self.peak_queued = 0
+        self.peak_chat_queued = 0
+
+    def process_update(self, update):
+        chat = None
+        if isinstance(update, Update):
+            chat = update.effective_chat
+        if self._executor is None or chat is None:
+            super().process_update(update)
+            return
+
+        with self._condition:
+            # a full chat queue or too many queued updates hold the
+            # dispatcher thread, so the update queue fills up and polling
+            # pauses or webhook answers 503
+            if not self._has_room(chat.id):
+                self.waits += 1
+                while not self._has_room(chat.id):
+                    self._condition.wait()
+            updates = self._chats.get(chat.id)
+            idle = updates is None
+            if idle:
+                updates = self._chats[chat.id] = deque()
+            updates.append(update)
+            self._queued += 1
+            self.peak_queued = max(self.peak_queued, self._queued)
+            self.peak_chat_queued = max(self.peak_chat_queued, len(updates))
+        if idle:
+            self._executor.submit(self._drain, chat.id)
+
+    def _has_room(self, chat_id):
+        return (
+            len(self._chats.get(chat_id, ())) < self.chat_queue_size
+            and self._queued < self.max_queued
+        )
+
+    def _drain(self, chat_id):
+        while True:
+            with self._condition:
+                updates = self._chats[chat_id]
+                if not updates:
+                    del self._chats[chat_id]
+                    return
+                update = updates.popleft()
+                self._queued -= 1
+                self._condition.notify_all()
+            try:
+                super().process_update(update)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+            with self._condition:
+                self.processed += 1
+
+    def stop(self):
+        super().stop()
+        # updates already taken from the update queue are handled
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+    def stats(self):
+        with self._condition:
+            return {
+                "concurrency": self.concurrency,
+                "chat_queue_size": self.chat_queue_size,
+                "active_chats": len(self._chats),
+                "queued": self._queued,
+                "peak_queued": self.peak_queued,
+                "peak_chat_queued": self.peak_chat_queued,
+                "processed": self.processed,
+                "waits": self.waits,
+            }
@@ -11,3 +11,103 @@ class Config:
         self.private_key = os.getenv("MARVEL_PRIVATE_KEY")
         self.public_key = os.getenv("MARVEL_PUBLIC_KEY")
         self.bot_token = os.getenv("BOT_TOKEN")
+        self.marvel_address = os.getenv("MARVEL_ADDRESS")
+
+        self.workers = int(os.getenv("WORKERS", 4))
+        self.connect_timeout = float(os.getenv("CONNECT_TIMEOUT", 3.05))
+        self.read_timeout = float(os.getenv("READ_TIMEOUT", 10))
+        self.warm_up = os.getenv("WARM_UP", "0") == "1"
+        self.async_fetcher = os.getenv("ASYNC_FETCHER", "0") == "1"
+        self.max_concurrency = int(os.getenv("MAX_CONCURRENCY", 100))
+        self.cache_size = int(os.getenv("CACHE_SIZE", 20000))
+        self.cache_max_bytes = int(
+            os.getenv("CACHE_MAX_BYTES", 64 * 1024 * 1024)
+        )
+        self.cache_ttls = {
+            route: int(os.environ[f"CACHE_TTL_{route.upper()}"])
+            for route in ("characters", "comics", "events", "series")
+            if f"CACHE_TTL_{route.upper()}" in os.environ
+        }
+        self.http_cache_path = os.getenv("HTTP_CACHE_PATH")
+        self.http_cache_max_bytes = int(
+            os.getenv("HTTP_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+        )
+        self.single_flight_timeout = float(
+            os.getenv("SINGLE_FLIGHT_TIMEOUT", 15)
+        )
+        self.prefetch = os.getenv("PREFETCH", "0") == "1"
+        self.prefetch_workers = int(os.getenv("PREFETCH_WORKERS", 2))
+        self.prefetch_daily_budget = int(
+            os.getenv("PREFETCH_DAILY_BUDGET", 500)
+        )
+        self.page_window = int(os.getenv("PAGE_WINDOW", 0))
+        self.mirror_path = os.getenv("MIRROR_PATH")
+        self.serve_from_mirror = os.getenv("SERVE_FROM_MIRROR", "0") == "1"
+        self.prefix_index = os.getenv("PREFIX_INDEX", "0") == "1"
+        self.quota_daily_budget = int(os.getenv("QUOTA_DAILY_BUDGET", 3000))
+        self.quota_rate = float(os.getenv("QUOTA_RATE", 5))
+        self.quota_burst = int(os.getenv("QUOTA_BURST", 10))
+        self.quota_max_wait = float(os.getenv("QUOTA_MAX_WAIT", 2))
+        self.admin_ids = [
+            int(admin_id)
+            for admin_id in os.getenv("ADMIN_IDS", "").split(",")
+            if admin_id.strip()
+        ]
+        self.streaming_parse = os.getenv("STREAMING_PARSE", "0") == "1"
+        self.lazy_entities = os.getenv("LAZY_ENTITIES", "0") == "1"
+        self.entity_store_size = int(os.getenv("ENTITY_STORE_SIZE", 50000))
+        self.entity_pin_ttl = float(os.getenv("ENTITY_PIN_TTL", 60 * 60))
+        self.file_id_cache_path = os.getenv(
+            "FILE_ID_CACHE_PATH", "file_ids.sqlite3"
+        )
+        self.file_id_cache_size = int(os.getenv("FILE_ID_CACHE_SIZE", 100000))
+        self.thumbnail_variant = os.getenv(
+            "THUMBNAIL_VARIANT", "portrait_uncanny"
+        )
+        self.thumbnail_cache_path = os.getenv("THUMBNAIL_CACHE_PATH")
+        self.thumbnail_cache_max_bytes = int(
+            os.getenv("THUMBNAIL_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+        )
+        self.update_queue_size = int(os.getenv("UPDATE_QUEUE_SIZE", 1000))
+        self.webhook_url = os.getenv("WEBHOOK_URL")
+        self.webhook_listen = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+        self.webhook_port = int(os.getenv("WEBHOOK_PORT", 8443))
+        self.webhook_secret = os.getenv("WEBHOOK_SECRET")
+        self.webhook_cert = os.getenv("WEBHOOK_CERT")
+        self.webhook_key = os.getenv("WEBHOOK_KEY")
+        self.chat_concurrency = int(
+            os.getenv("CHAT_CONCURRENCY", self.workers)
+        )
+        self.chat_queue_size = int(os.getenv("CHAT_QUEUE_SIZE", 10))
+        self.compiled_routing = os.getenv("COMPILED_ROUTING", "1") == "1"
+        self.render_cache_size = int(os.getenv("RENDER_CACHE_SIZE", 1000))
+        self.caption_cache_size = int(os.getenv("CAPTION_CACHE_SIZE", 10000))
+        self.caption_warm_up = os.getenv("CAPTION_WARM_UP", "0") == "1"
+        if self.async_fetcher:
+            self.check_async_fetcher()
+        # the webhook endpoint is public, only the secret tells updates
+        # sent by Telegram from forged ones
+        if self.webhook_url and not self.webhook_secret:
+            raise ValueError(
+                "WEBHOOK_URL can not be used without WEBHOOK_SECRET"
+            )
+
+    def check_async_fetcher(self):
+        # asyncio-based fetcher shares quota and response cache with
+        # Fetcher, other Fetcher features are not implemented for it
+        unsupported = [
+            name
+            for name, value in (
+                ("HTTP_CACHE_PATH", self.http_cache_path),
+                ("PREFETCH", self.prefetch),
+                ("PAGE_WINDOW", self.page_window),
+                ("SERVE_FROM_MIRROR", self.serve_from_mirror),
+                ("PREFIX_INDEX", self.prefix_index),
+                ("STREAMING_PARSE", self.streaming_parse),
+            )
+            if value
+        ]
+        if unsupported:
+            raise ValueError(
+                "ASYNC_FETCHER can not be used with " + ", ".join(unsupported)
+            )
@@ -1,8 +1,14 @@
 START_OVER = "START_OVER"
 MSG_DELETED = "MSG_DELETED"
 OFFSET = "OFFSET"
+PAGE_OFFSET = "PAGE_OFFSET"
 DATA = "DATA"
 INPUT_FOR = "INPUT_FOR"
 FETCHER = "FETCHER"
-FEATURES = "FEATURES"
+FILE_IDS = "FILE_IDS"
+THUMBNAILS = "THUMBNAILS"
+RENDERS = "RENDERS"
+CAPTIONS = "CAPTIONS"
+WEBHOOK = "WEBHOOK"
+DISPATCHER = "DISPATCHER"
 LIMIT = 10
@@ -0,0 +1,95 @@
+import sys
+import time
+import argparse
+import traceback
+
+from config import Config
+from fetcher import Fetcher, Route
+from fetcher.quota import Priority
+from fetcher.exceptions import QuotaExceeded
+
+PAGE_SIZE = 100
+
+
+def crawl_route(fetcher, route, page_size, retries, delay):
+    mirror = fetcher.mirror
+    parser = fetcher.LIST_PARSERS[route]
+    offset, total = mirror.progress(route)
+
+    while total is None or offset < total:
+        for attempt in range(retries + 1):
+            try:
+                r_json = fetcher.fetch_json(
+                    route, Priority.CRAWL, limit=page_size, offset=offset
+                )
+                break
+            except QuotaExceeded:
+                raise
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+                if attempt == retries:
+                    raise
+                time.sleep(delay * 2**attempt)
+
+        results, count, total = parser.extract_data(r_json)
+        records = [
+            (
+                result["id"],
+                parser.extract_base_features(result)["name"],
+                result,
+            )
+            for result in results
+        ]
+        offset += count
+        mirror.store(route, records, offset, total)
+        print(f"{route.name.lower()}: {offset}/{total}")
+        if not count:
+            break
+
+
+def route_type(name):
+    try:
+        return Route[name.upper()]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"unknown route {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Copy Marvel API collections into local mirror, "
+        "interrupted crawl continues from the last stored page"
+    )
+    parser.add_argument(
+        "routes",
+        nargs="*",
+        type=route_type,
+        help="characters, comics, events or series, all if omitted",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="crawl from the first page, already stored entities are updated",
+    )
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=1.0)
+    args = parser.parse_args()
+
+    config = Config()
+    if not config.mirror_path:
+        parser.error("MIRROR_PATH is not set")
+
+    fetcher = Fetcher(config)
+    try:
+        for route in args.routes or list(Route):
+            if args.restart:
+                fetcher.mirror.reset(route)
+            crawl_route(
+                fetcher, route, args.page_size, args.retries, args.delay
+            )
+    finally:
+        fetcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from .fetcher import Fetcher, Route
+from .async_fetcher import AsyncFetcher, SyncFetcher
 
 
-__all__ = ["Fetcher", "Route"]
+__all__ = ["Fetcher", "Route", "AsyncFetcher", "SyncFetcher"]
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+
+import aiohttp
+
+from fetcher.fetcher import Fetcher
+from fetcher.cache import cache_key
+from fetcher.quota import Priority
+from fetcher.entity_store import EntityStore
+from fetcher.single_flight import SingleFlight
+from fetcher.exceptions import FetcherException
+
+
+class AsyncFetcher:
+    ADDRESS = Fetcher.ADDRESS
+    ROUTES = Fetcher.ROUTES
+    LIST_PARSERS = Fetcher.LIST_PARSERS
+
+    def __init__(self, config):
+        self._config = config
+        self.address = config.marvel_address or self.ADDRESS
+        self._timeout = aiohttp.ClientTimeout(
+            sock_connect=config.connect_timeout,
+            sock_read=config.read_timeout,
+        )
+        self._session = None
+        self._semaphore = None
+        self.quota = Fetcher.quota_scheduler(config)
+
+    async def start(self):
+        connector = aiohttp.TCPConnector(limit=self._config.max_concurrency)
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=self._timeout
+        )
+        self._semaphore = asyncio.Semaphore(self._config.max_concurrency)
+
+    async def close(self):
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def make_request(
+        self, route, priority=Priority.USER, _id=None, **kwargs
+    ):
+        # the scheduler may sleep, so it waits outside of the event loop
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.quota.acquire, priority
+        )
+        params = Fetcher.auth_params(
+            self._config.private_key, self._config.public_key
+        )
+        params.update(kwargs)
+        path = self.ROUTES[route]
+        if _id is not None:
+            path = f"{path}/{_id}"
+        query = f"{self.address}/v1/public/{path}"
+
+        async with self._semaphore:
+            async with self._session.get(query, params=params) as response:
+                if response.status == 200:
+                    return await response.json()
+                text = await response.text()
+                if response.status == 429:
+                    self.quota.rate_limited(
+                        text, response.headers.get("Retry-After")
+                    )
+                raise FetcherException(response.status, text)
+
+    async def list_entities(self, route, **kwargs):
+        parser = self.LIST_PARSERS[route]
+        r_json = await self.make_request(route, **kwargs)
+        return parser.parse(r_json, self._config.lazy_entities)
+
+    async def get_entity(self, route, _id):
+        parsed_entities = await self.list_entities(route, _id=_id)
+        return next(iter(parsed_entities.entities), None)
+
+    async def gather_many(self, queries, return_exceptions=False):
+        return await asyncio.gather(
+            *(
+                self.list_entities(route, **kwargs)
+                for route, kwargs in queries
+            ),
+            return_exceptions=return_exceptions,
+        )
+
+
+# caches and collapses requests of dispatcher threads like Fetcher, only
+# requests which miss the response cache reach the event loop
+class SyncFetcher:
+    def __init__(self, async_fetcher, config):
+        self._fetcher = async_fetcher
+        self.cache = Fetcher.response_cache(config)
+        self.single_flight = SingleFlight(config.single_flight_timeout)
+        self.entities = EntityStore(
+            config.entity_store_size, config.entity_pin_ttl
+        )
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, daemon=True
+        )
+        self._thread.start()
+        self._run(self._fetcher.start())
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def list_entities(self, route, **kwargs):
+        key = cache_key(route, kwargs)
+        parsed_entities = self.cache.get(key)
+        if parsed_entities is None:
+            parsed_entities = self.single_flight.do(
+                key, self._fetch_entities, route, key, **kwargs
+            )
+        self.entities.put(route, parsed_entities.entities)
+        return parsed_entities
+
+    def _fetch_entities(self, route, key, **kwargs):
+        parsed_entities = self._run(
+            self._fetcher.list_entities(route, **kwargs)
+        )
+        self.cache.put(key, parsed_entities)
+        return parsed_entities
+
+    def get_entity(self, route, _id):
+        entity = self.entities.get(route, _id)
+        if entity is None:
+            entity = self._run(self._fetcher.get_entity(route, _id))
+            if entity is not None:
+                self.entities.put(route, [entity])
+        return entity
+
+    def gather_many(self, queries, return_exceptions=False):
+        return self._run(self._fetcher.gather_many(queries, return_exceptions))
+
+    def prefetch(self, owner, route, **kwargs):
+        pass
+
+    def cancel_prefetch(self, owner):
+        pass
+
+    def stats(self):
+        return {
+            "quota": self._fetcher.quota.state(),
+            "cache": self.cache.stats(),
+            "single_flight": self.single_flight.stats(),
+            "entities": self.entities.stats(),
+        }
+
+    def close(self):
+        self._run(self._fetcher.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
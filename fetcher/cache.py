@@ -0,0 +1,125 @@
+import time
+import threading
+from collections import OrderedDict
+
+AUTH_PARAMS = ("ts", "apikey", "hash")
+NAME_FILTERS = ("name", "nameStartsWith", "title", "titleStartsWith")
+# charged per entity when the size of the response body is not known
+ENTITY_BYTES = 4 * 1024
+
+
+def cache_key(route, params):
+    normalized = []
+    for param, value in params.items():
+        if param in AUTH_PARAMS:
+            continue
+        value = str(value)
+        if param in NAME_FILTERS:
+            # same normalization as Mirror.name_key
+            value = value.casefold()
+        normalized.append((param, value))
+    return int(route), tuple(sorted(normalized))
+
+
+class _Entry:
+    __slots__ = ("value", "size", "nbytes", "expires_at")
+
+    def __init__(self, value, size, nbytes, expires_at):
+        self.value = value
+        self.size = size
+        self.nbytes = nbytes
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    def __init__(self, max_size, ttls, default_ttl=0, max_bytes=0):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._ttls = ttls
+        self._default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._size = 0
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                # expired entries are kept until evicted, so they still
+                # can be revalidated with their etag
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def fresh(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.expires_at > time.monotonic()
+
+    def stale(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry else None
+
+    def put(self, key, parsed_entities):
+        size = max(len(parsed_entities.entities), 1)
+        ttl = self._ttls.get(key[0], self._default_ttl)
+        if size > self.max_size or ttl <= 0:
+            return
+        # the response body stands in for the memory of its entities, so
+        # caching costs no more than counting them
+        nbytes = parsed_entities.nbytes or size * ENTITY_BYTES
+        if self.max_bytes and nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and (
+                self._size + size > self.max_size
+                or (self.max_bytes and self._nbytes + nbytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = _Entry(
+                parsed_entities, size, nbytes, time.monotonic() + ttl
+            )
+            self._size += size
+            self._nbytes += nbytes
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+        self._nbytes -= entry.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size": self._size,
+                "max_size": self.max_size,
+                "bytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -1,5 +1,31 @@
-from .general import Creator
-from .entity import EntityBuilder
+from .general import Creator, intern
+from .entity import (
+    Entity,
+    EntityBuilder,
+    LazyEntity,
+    CharacterEntity,
+    ComicEntity,
+    EventEntity,
+    SeriesEntity,
+    LazyCharacterEntity,
+    LazyComicEntity,
+    LazyEventEntity,
+    LazySeriesEntity,
+)
 
 
-__all__ = ["Creator", "EntityBuilder"]
+__all__ = [
+    "Creator",
+    "intern",
+    "Entity",
+    "EntityBuilder",
+    "LazyEntity",
+    "CharacterEntity",
+    "ComicEntity",
+    "EventEntity",
+    "SeriesEntity",
+    "LazyCharacterEntity",
+    "LazyComicEntity",
+    "LazyEventEntity",
+    "LazySeriesEntity",
+]
@@ -6,6 +6,7 @@ class BaseEntity:
         "img_link",
         "detail",
         "_resource_uri",
+        "modified",
     )
 
 
@@ -23,14 +24,100 @@ class Entity(BaseEntity):
     )
 
 
+class CharacterEntity(BaseEntity):
+    __slots__ = ("wiki",)
+
+
+class ComicEntity(BaseEntity):
+    __slots__ = ("page_count", "creators")
+
+
+class EventEntity(BaseEntity):
+    __slots__ = ("start", "end", "next_", "previous", "wiki")
+
+
+class SeriesEntity(BaseEntity):
+    __slots__ = ("start", "end", "next_", "previous")
+
+
+def _features(entity_cls):
+    return frozenset(
+        feature
+        for cls in entity_cls.__mro__
+        for feature in getattr(cls, "__slots__", ())
+    )
+
+
+class LazyEntityMixin:
+    __slots__ = ()
+
+    FEATURES = frozenset()
+
+    def __init__(self, _id, name, raw, parser):
+        self._id = _id
+        self.name = name
+        self._raw = raw
+        self._parser = parser
+
+    def __getattr__(self, feature):
+        # called only for features which are not set yet
+        if feature not in self.FEATURES or self._raw is None:
+            raise AttributeError(feature)
+        self._materialize()
+        return object.__getattribute__(self, feature)
+
+    def _materialize(self):
+        raw, parser = self._raw, self._parser
+        builder = EntityBuilder()
+        builder.reset(self)
+        builder.add_base_features(parser.extract_base_features(raw))
+        parser.add_custom_features(
+            builder, parser.extract_custom_features(raw)
+        )
+        # cleared last, so concurrent readers either build features too
+        # or find them already set
+        self._raw = None
+
+
+class LazyEntity(LazyEntityMixin, Entity):
+    __slots__ = ("_raw", "_parser")
+
+    FEATURES = _features(Entity)
+
+
+class LazyCharacterEntity(LazyEntityMixin, CharacterEntity):
+    __slots__ = ("_raw", "_parser")
+
+    FEATURES = _features(CharacterEntity)
+
+
+class LazyComicEntity(LazyEntityMixin, ComicEntity):
+    __slots__ = ("_raw", "_parser")
+
+    FEATURES = _features(ComicEntity)
+
+
+class LazyEventEntity(LazyEntityMixin, EventEntity):
+    __slots__ = ("_raw", "_parser")
+
+    FEATURES = _features(EventEntity)
+
+
+class LazySeriesEntity(LazyEntityMixin, SeriesEntity):
+    __slots__ = ("_raw", "_parser")
+
+    FEATURES = _features(SeriesEntity)
+
+
 class EntityBuilder:
 
-    def __init__(self):
+    def __init__(self, entity_cls=Entity):
+        self.entity_cls = entity_cls
         self.entity = None
         self.reset()
 
-    def reset(self):
-        self.entity = Entity()
+    def reset(self, entity=None):
+        self.entity = entity if entity is not None else self.entity_cls()
 
     def add_base_features(self, base_features):
         for feature, value in base_features.items():
@@ -1,8 +1,18 @@
+import sys
+
+
+def intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 class Creator:
+    __slots__ = ("_resource_uri", "name", "role")
+
     def __init__(self, resource_uri, name, role):
-        self._resource_uri = resource_uri
-        self.name = name
-        self.role = role
+        # the same creators and roles repeat across thousands of comics
+        self._resource_uri = intern(resource_uri)
+        self.name = intern(name)
+        self.role = intern(role)
 
     def __repr__(self):
         return f"{self.role}: {self.name}"
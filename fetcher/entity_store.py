@@ -0,0 +1,116 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class EntityStore:
+    def __init__(self, max_size, pin_ttl=60 * 60):
+        self.max_size = max_size
+        self.pin_ttl = pin_ttl
+        self._entities = OrderedDict()
+        self._references = {}
+        # owner -> (route, ids, expires_at), oldest pins first
+        self._pins = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired_pins = 0
+
+    def put(self, route, entities):
+        with self._lock:
+            for entity in entities:
+                key = (int(route), entity._id)
+                self._entities[key] = entity
+                self._entities.move_to_end(key)
+            self._evict()
+
+    def get(self, route, _id):
+        key = (int(route), _id)
+        with self._lock:
+            entity = self._entities.get(key)
+            if entity is None:
+                self.misses += 1
+            else:
+                self._entities.move_to_end(key)
+                self.hits += 1
+            return entity
+
+    def pin(self, owner, route, ids):
+        # an owner keeps only the page it shows last
+        with self._lock:
+            self._unpin(owner)
+            self._retain(route, ids)
+            self._pins[owner] = (
+                route,
+                ids,
+                time.monotonic() + self.pin_ttl,
+            )
+            self._expire()
+            self._evict()
+
+    def unpin(self, owner):
+        with self._lock:
+            self._unpin(owner)
+            self._evict()
+
+    def _unpin(self, owner):
+        pin = self._pins.pop(owner, None)
+        if pin is not None:
+            self._release(*pin[:2])
+
+    def _expire(self):
+        # chats which left a page open without leaving it stop holding
+        # its entities after pin_ttl
+        now = time.monotonic()
+        while self._pins:
+            owner, (route, ids, expires_at) = next(iter(self._pins.items()))
+            if expires_at > now:
+                break
+            del self._pins[owner]
+            self._release(route, ids)
+            self.expired_pins += 1
+
+    def _retain(self, route, ids):
+        for _id in ids:
+            key = (int(route), _id)
+            self._references[key] = self._references.get(key, 0) + 1
+
+    def _release(self, route, ids):
+        for _id in ids:
+            key = (int(route), _id)
+            references = self._references.get(key, 0) - 1
+            if references > 0:
+                self._references[key] = references
+            else:
+                self._references.pop(key, None)
+
+    def _evict(self):
+        # entities shown to some chat right now are skipped
+        excess = len(self._entities) - self.max_size
+        if excess <= 0:
+            return
+        self._expire()
+        evicted = []
+        for key in self._entities:
+            if key not in self._references:
+                evicted.append(key)
+                if len(evicted) == excess:
+                    break
+        for key in evicted:
+            del self._entities[key]
+        self.evictions += len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entities": len(self._entities),
+                "referenced": len(self._references),
+                "pins": len(self._pins),
+                "expired_pins": self.expired_pins,
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
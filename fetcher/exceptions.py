@@ -11,3 +11,10 @@ response.text is {self.text}
 """
         else:
             return "Fetcher Exception has been raised"
+
+
+class QuotaExceeded(FetcherException):
+    def __init__(self, text, priority=None):
+        super().__init__(429, text)
+        # priority of the dropped request
+        self.priority = priority
@@ -1,11 +1,26 @@
+import io
+import sys
+import json
 import hashlib
 import datetime
+import threading
+import traceback
 
 from enum import IntEnum
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from fetcher.exceptions import FetcherException
+from fetcher.exceptions import FetcherException, QuotaExceeded
+from fetcher.cache import ResponseCache, cache_key
+from fetcher.http_cache import HttpCache
+from fetcher.entity_store import EntityStore
+from fetcher.mirror import Mirror
+from fetcher.prefetch import Prefetcher
+from fetcher.prefix_index import PrefixIndex
+from fetcher.quota import Priority, QuotaScheduler
+from fetcher.single_flight import SingleFlight
+from fetcher.parser.base_parser import ParsedEntities, STREAMING_BACKEND
 from fetcher.parser import (
     ComicParser,
     EventParser,
@@ -22,7 +37,7 @@ class Route(IntEnum):
 
 
 class Fetcher:
-    ADDRESS = "gateway.marvel.com:443"
+    ADDRESS = "https://gateway.marvel.com:443"
     ROUTES = {
         Route.CHARACTERS: "characters",
         Route.COMICS: "comics",
@@ -35,41 +50,340 @@ class Fetcher:
         Route.EVENTS: EventParser,
         Route.SERIES: SeriesParser,
     }
+    CACHE_TTLS = {
+        Route.CHARACTERS: 24 * 60 * 60,
+        Route.COMICS: 6 * 60 * 60,
+        Route.EVENTS: 24 * 60 * 60,
+        Route.SERIES: 12 * 60 * 60,
+    }
 
-    def __init__(self, config):
+    def __init__(self, config, session=None):
         self._config = config
+        self.address = config.marvel_address or self.ADDRESS
+        self._timeout = (config.connect_timeout, config.read_timeout)
+        self.streaming_parse = config.streaming_parse
+        if self.streaming_parse and STREAMING_BACKEND is None:
+            print(
+                "STREAMING_PARSE disabled, it needs yajl2_c backend of ijson",
+                file=sys.stderr,
+            )
+            self.streaming_parse = False
+        # handlers run on run_async workers or chat threads, prefetches on
+        # their own pool
+        self._session = session or self.make_session(
+            max(config.workers, config.chat_concurrency)
+            + config.prefetch_workers
+        )
+        self.cache = self.response_cache(config)
+        self.single_flight = SingleFlight(config.single_flight_timeout)
+        self.entities = EntityStore(
+            config.entity_store_size, config.entity_pin_ttl
+        )
+        self.quota = self.quota_scheduler(config)
+        self.http_cache = None
+        if config.http_cache_path:
+            self.http_cache = HttpCache(
+                config.http_cache_path, config.http_cache_max_bytes
+            )
+        self.mirror = None
+        if config.mirror_path:
+            self.mirror = Mirror(config.mirror_path, config.lazy_entities)
+        self._indexes = {}
+        self._indexes_lock = threading.Lock()
+        self.indexed = threading.Event()
+        if self.mirror and config.serve_from_mirror and config.prefix_index:
+            # a whole mirrored route takes seconds to index, so it is built
+            # in background instead of on the first search
+            threading.Thread(target=self.build_indexes, daemon=True).start()
+        self.prefetcher = None
+        # pages served from the mirror cost no upstream request
+        if config.prefetch and not (self.mirror and config.serve_from_mirror):
+            self.prefetcher = Prefetcher(
+                self, config.prefetch_workers, config.prefetch_daily_budget
+            )
+        if config.warm_up:
+            self.warm_up()
+
+    @classmethod
+    def response_cache(cls, config):
+        return ResponseCache(
+            config.cache_size,
+            {
+                route: config.cache_ttls.get(cls.ROUTES[route], ttl)
+                for route, ttl in cls.CACHE_TTLS.items()
+            },
+            max_bytes=config.cache_max_bytes,
+        )
+
+    @staticmethod
+    def quota_scheduler(config):
+        return QuotaScheduler(
+            config.quota_daily_budget,
+            config.quota_rate,
+            config.quota_burst,
+            config.quota_max_wait,
+        )
+
+    @staticmethod
+    def make_session(pool_size):
+        # keep-alive connections are reused across requests, so the TCP and
+        # TLS handshakes are paid once per pooled connection
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def warm_up(self):
+        try:
+            self._session.head(f"{self.address}/", timeout=self._timeout)
+        except requests.RequestException:
+            traceback.print_exc(file=sys.stderr)
+
+    def close(self):
+        if self.prefetcher:
+            self.prefetcher.shutdown()
+        self._session.close()
+        if self.http_cache:
+            self.http_cache.close()
+        if self.mirror:
+            self.mirror.close()
 
     @staticmethod
-    def make_request_(address, route, private_key, public_key, **kwargs):
+    def auth_params(private_key, public_key):
         ts = int(datetime.datetime.now().timestamp())
         digest = hashlib.md5(
             f"{ts}{private_key}{public_key}".encode("utf-8")
         ).hexdigest()
-        params = {"ts": ts, "apikey": public_key, "hash": digest}
+        return {"ts": ts, "apikey": public_key, "hash": digest}
+
+    @staticmethod
+    def make_request_(
+        address,
+        route,
+        private_key,
+        public_key,
+        session=requests,
+        timeout=None,
+        headers=None,
+        stream=False,
+        **kwargs,
+    ):
+        params = Fetcher.auth_params(private_key, public_key)
 
-        query = f"https://{address}/v1/public/{route}"
+        query = f"{address}/v1/public/{route}"
 
         params.update(kwargs)
-        response = requests.get(query, params=params)
+        response = session.get(
+            query,
+            params=params,
+            timeout=timeout,
+            headers=headers,
+            stream=stream,
+        )
         return response
 
-    def make_request(self, route, **kwargs):
-        return self.make_request_(
-            self.ADDRESS,
-            self.ROUTES[route],
+    def make_request(self, route, priority=Priority.USER, _id=None, **kwargs):
+        path = self.ROUTES[route]
+        if _id is not None:
+            path = f"{path}/{_id}"
+
+        self.quota.acquire(priority)
+        response = self.make_request_(
+            self.address,
+            path,
             self._config.private_key,
             self._config.public_key,
+            session=self._session,
+            timeout=self._timeout,
             **kwargs,
         )
+        if response.status_code == 429:
+            self.quota.rate_limited(
+                response.text, response.headers.get("Retry-After")
+            )
+        return response
+
+    def window(self, params):
+        window = self._config.page_window
+        limit = params.get("limit")
+        if not window or not limit:
+            return None
+
+        offset = params.get("offset", 0)
+        window_offset = offset - offset % window
+        if offset + limit > window_offset + window:
+            return None
+        return {**params, "limit": window, "offset": window_offset}
+
+    def cache_key(self, route, params):
+        return cache_key(route, self.window(params) or params)
+
+    def prefetch(self, owner, route, **kwargs):
+        if self.prefetcher:
+            self.prefetcher.prefetch(owner, route, **kwargs)
+
+    def cancel_prefetch(self, owner):
+        if self.prefetcher:
+            self.prefetcher.cancel(owner)
 
-    def list_entities(self, route, **kwargs):
+    def fetch_json(self, route, priority=Priority.USER, **kwargs):
+        response = self.make_request(route, priority, **kwargs)
+        if response.status_code != 200:
+            raise FetcherException(response.status_code, response.text)
+        return response.json()
+
+    def stats(self):
+        stats = {
+            "quota": self.quota.state(),
+            "cache": self.cache.stats(),
+            "single_flight": self.single_flight.stats(),
+            "entities": self.entities.stats(),
+        }
+        if self.http_cache:
+            stats["http_cache"] = self.http_cache.stats()
+        if self.prefetcher:
+            stats["prefetch"] = self.prefetcher.stats()
+        return stats
+
+    def index(self, route):
+        # None until the index of the route is built, searches go to the
+        # mirror meanwhile
+        with self._indexes_lock:
+            return self._indexes.get(route)
+
+    def build_index(self, route):
+        index = PrefixIndex.from_mirror(
+            self.mirror, route, self.LIST_PARSERS[route]
+        )
+        with self._indexes_lock:
+            self._indexes[route] = index
+        return index
+
+    def build_indexes(self):
+        try:
+            for route in self.ROUTES:
+                self.build_index(route)
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+        finally:
+            self.indexed.set()
+
+    def get_entity(self, route, _id):
+        entity = self.entities.get(route, _id)
+        if entity is None:
+            if self.mirror and self._config.serve_from_mirror:
+                raw = self.mirror.get_raw(route, _id)
+                results = [raw] if raw else []
+                r_json = {
+                    "data": {"results": results, "count": 1, "total": 1}
+                }
+            else:
+                r_json = self.fetch_json(route, _id=_id)
+            parsed_entities = self.LIST_PARSERS[route].parse(
+                r_json, self._config.lazy_entities
+            )
+            if not parsed_entities.entities:
+                return None
+            entity = parsed_entities.entities[0]
+            self.entities.put(route, [entity])
+        return entity
+
+    def list_entities(self, route, priority=Priority.USER, **kwargs):
+        parsed_entities = self._list_page(route, priority, **kwargs)
+        self.entities.put(route, parsed_entities.entities)
+        return parsed_entities
+
+    def _list_page(self, route, priority, **kwargs):
+        if self.mirror and self._config.serve_from_mirror:
+            index = self.index(route) if self._config.prefix_index else None
+            if index is not None:
+                return index.list_entities(**kwargs)
+            return self.mirror.list_entities(
+                route, self.LIST_PARSERS[route], **kwargs
+            )
+
+        window_params = self.window(kwargs)
+        if window_params is None:
+            return self._cached_entities(route, priority, **kwargs)
+
+        window = self._cached_entities(route, priority, **window_params)
+        start = kwargs.get("offset", 0) - window_params["offset"]
+        entities = window.entities[start : start + kwargs["limit"]]
+        return ParsedEntities(
+            entities, len(entities), window.total, window.etag
+        )
+
+    def _cached_entities(self, route, priority, **kwargs):
+        key = cache_key(route, kwargs)
+        parsed_entities = self.cache.get(key)
+        if parsed_entities is not None and self.prefetcher:
+            self.prefetcher.used(key)
+        while parsed_entities is None:
+            try:
+                parsed_entities = self.single_flight.do(
+                    key, self._fetch_entities, route, key, priority, **kwargs
+                )
+            except QuotaExceeded as e:
+                # joined a request of lower priority which was dropped,
+                # it is issued again with the priority of this one
+                if e.priority is None or e.priority <= priority:
+                    raise
+        return parsed_entities
+
+    def parse(self, parser, body):
+        lazy = self._config.lazy_entities
+        if self.streaming_parse:
+            return parser.parse_stream(io.BytesIO(body), lazy)
+        return parser.parse(json.loads(body), lazy)
+
+    def _fetch_entities(self, route, key, priority, **kwargs):
+        parsed_entities = self._list_entities(route, key, priority, **kwargs)
+        self.cache.put(key, parsed_entities)
+        return parsed_entities
+
+    def _list_entities(self, route, key, priority, **kwargs):
         parser = self.LIST_PARSERS[route]
+        stale = self.cache.stale(key)
+        disk_key = repr(key)
+        stored = self.http_cache.get(disk_key) if self.http_cache else None
 
-        response = self.make_request(route, **kwargs)
-        if response.status_code == 200:
-            r_json = response.json()
-            parsed_entities = parser.parse(r_json)
+        etag = None
+        if stale is not None and stale.etag:
+            etag = stale.etag
+        elif stored:
+            etag = stored[0]
+        headers = {"If-None-Match": etag} if etag else None
+
+        # without disk cache the body is not kept, so it can be decoded
+        # straight from the socket
+        stream = self.streaming_parse and not self.http_cache
+        response = self.make_request(
+            route, priority, headers=headers, stream=stream, **kwargs
+        )
+        if response.status_code == 304:
+            if self.http_cache and stored:
+                self.http_cache.revalidated(disk_key)
+            if stale is not None and stale.etag == etag:
+                return stale
+            parsed_entities = self.parse(parser, stored[1])
+            parsed_entities.nbytes = len(stored[1])
+        elif response.status_code == 200:
+            if stream:
+                response.raw.decode_content = True
+                parsed_entities = parser.parse_stream(
+                    response.raw, self._config.lazy_entities
+                )
+                response.close()
+            else:
+                parsed_entities = self.parse(parser, response.content)
+                parsed_entities.nbytes = len(response.content)
+            if self.http_cache:
+                self.http_cache.put(
+                    disk_key, response.headers.get("ETag"), response.content
+                )
         else:
             raise FetcherException(response.status_code, response.text)
 
+        parsed_entities.etag = response.headers.get("ETag", etag)
         return parsed_entities
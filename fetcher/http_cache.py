@@ -0,0 +1,93 @@
+import time
+import sqlite3
+import threading
+
+
+class HttpCache:
+    def __init__(self, path, max_bytes):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT, body BLOB, "
+            "size INTEGER, accessed REAL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed "
+            "ON responses (accessed)"
+        )
+        self._connection.commit()
+        (self._size,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return row
+
+    def revalidated(self, key):
+        with self._lock:
+            self.revalidations += 1
+            self._connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._connection.commit()
+
+    def put(self, key, etag, body):
+        size = len(body)
+        if not etag or size > self.max_bytes:
+            return
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                self._size -= row[0]
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, etag, body, size, time.time()),
+            )
+            self._size += size
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self):
+        while self._size > self.max_bytes:
+            key, size = self._connection.execute(
+                "SELECT key, size FROM responses ORDER BY accessed LIMIT 1"
+            ).fetchone()
+            self._connection.execute(
+                "DELETE FROM responses WHERE key = ?", (key,)
+            )
+            self._size -= size
+            self.evictions += 1
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,122 @@
+import json
+import sqlite3
+import threading
+
+EXACT_FILTERS = ("name", "title")
+PREFIX_FILTERS = ("nameStartsWith", "titleStartsWith")
+PREFIX_END = "\U0010ffff"
+
+
+class Mirror:
+    def __init__(self, path, lazy=False):
+        self.lazy = lazy
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS entities (
+                route INTEGER, id INTEGER, name_key TEXT, raw TEXT,
+                PRIMARY KEY (route, id)
+            );
+            CREATE INDEX IF NOT EXISTS entities_name
+                ON entities (route, name_key, id);
+            CREATE TABLE IF NOT EXISTS progress (
+                route INTEGER PRIMARY KEY, next_offset INTEGER, total INTEGER
+            );
+            """)
+
+    @staticmethod
+    def name_key(name):
+        # Marvel ignores case of name filters, but not surrounding spaces
+        return name.casefold()
+
+    def progress(self, route):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT next_offset, total FROM progress WHERE route = ?",
+                (int(route),),
+            ).fetchone()
+        return row if row else (0, None)
+
+    def reset(self, route):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM progress WHERE route = ?", (int(route),)
+            )
+
+    def store(self, route, records, next_offset, total):
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO entities VALUES (?, ?, ?, ?)",
+                (
+                    (int(route), _id, self.name_key(name), json.dumps(raw))
+                    for _id, name, raw in records
+                ),
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO progress VALUES (?, ?, ?)",
+                (int(route), next_offset, total),
+            )
+
+    def get_raw(self, route, _id):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT raw FROM entities WHERE route = ? AND id = ?",
+                (int(route), _id),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self, route):
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM entities WHERE route = ?", (int(route),)
+            ).fetchone()
+        return count
+
+    def iter_raw(self, route):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT raw FROM entities WHERE route = ? "
+                "ORDER BY name_key, id",
+                (int(route),),
+            ).fetchall()
+        for (raw,) in rows:
+            yield json.loads(raw)
+
+    def list_entities(self, route, parser, limit=20, offset=0, **kwargs):
+        condition = "route = ?"
+        args = [int(route)]
+        for key, value in kwargs.items():
+            if key in EXACT_FILTERS:
+                condition += " AND name_key = ?"
+                args.append(self.name_key(value))
+            elif key in PREFIX_FILTERS:
+                # a range over the index instead of LIKE, which cannot use it
+                prefix = self.name_key(value)
+                condition += " AND name_key >= ? AND name_key < ?"
+                args.extend((prefix, prefix + PREFIX_END))
+
+        with self._lock:
+            (total,) = self._connection.execute(
+                f"SELECT COUNT(*) FROM entities WHERE {condition}", args
+            ).fetchone()
+            rows = self._connection.execute(
+                f"SELECT raw FROM entities WHERE {condition} "
+                "ORDER BY name_key, id LIMIT ? OFFSET ?",
+                args + [int(limit), int(offset)],
+            ).fetchall()
+
+        results = [json.loads(raw) for (raw,) in rows]
+        return parser.parse(
+            {
+                "data": {
+                    "results": results,
+                    "count": len(results),
+                    "total": total,
+                }
+            },
+            self.lazy,
+        )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -1,23 +1,103 @@
 import abc
 
-from fetcher.entities import EntityBuilder
+import ijson
+
+from fetcher.entities import Entity, EntityBuilder, LazyEntity, intern
+
+RESULTS_PREFIX = "data.results.item"
+
+try:
+    # pure Python backends of ijson decode about 15 times slower than
+    # json.loads, so responses are streamed only with the C one
+    STREAMING_BACKEND = ijson.get_backend("yajl2_c")
+except ImportError:
+    STREAMING_BACKEND = None
 
 
 class BaseParser(abc.ABC):
+    # fields of a result read by extract_base_features
+    BASE_FIELDS = (
+        "id",
+        "name",
+        "title",
+        "description",
+        "variantDescription",
+        "thumbnail",
+        "resourceURI",
+        "urls",
+        "modified",
+    )
+    # fields of a result read by extract_custom_features
+    CUSTOM_FIELDS = ()
+    ENTITY = Entity
+    LAZY_ENTITY = LazyEntity
+
     @classmethod
-    def parse(cls, response_json):
+    def parse(cls, response_json, lazy=False):
         results, count, total = cls.extract_data(response_json)
-        entities = list()
-        builder = EntityBuilder()
+        entities = list(cls.build_entities(results, lazy))
+        return ParsedEntities(entities, count, total)
+
+    @classmethod
+    def build_entities(cls, results, lazy=False):
+        if lazy:
+            # only the fields read on materialization are kept, related
+            # collections of a result outweigh the entity itself
+            fields = cls.BASE_FIELDS + cls.CUSTOM_FIELDS
+            for result in results:
+                raw = {
+                    field: result[field] for field in fields if field in result
+                }
+                yield cls.LAZY_ENTITY(
+                    result["id"], cls.extract_name(result), raw, cls
+                )
+            return
 
+        builder = EntityBuilder(cls.ENTITY)
         for result in results:
             base_features = cls.extract_base_features(result)
             custom_features = cls.extract_custom_features(result)
             builder.add_base_features(base_features)
             cls.add_custom_features(builder, custom_features)
-            entities.append(builder.finish())
+            yield builder.finish()
 
-        return ParsedEntities(entities, count, total)
+    @classmethod
+    def parse_stream(cls, stream, lazy=False):
+        meta = {}
+        entities = list(
+            cls.build_entities(cls.iter_results(stream, meta), lazy)
+        )
+        return ParsedEntities(
+            entities, meta.get("count", 0), meta.get("total", 0)
+        )
+
+    @classmethod
+    def iter_results(cls, stream, meta):
+        fields = set(cls.BASE_FIELDS + cls.CUSTOM_FIELDS)
+        item = None
+        selected = False
+
+        if STREAMING_BACKEND is None:
+            raise RuntimeError("yajl2_c backend of ijson is not available")
+        events = STREAMING_BACKEND.parse(stream, use_float=True)
+        for prefix, event, value in events:
+            if prefix == RESULTS_PREFIX:
+                if event == "map_key":
+                    selected = value in fields
+                    if selected:
+                        item.event(event, value)
+                elif event == "start_map":
+                    item = ijson.ObjectBuilder()
+                    item.event(event, value)
+                elif event == "end_map":
+                    item.event(event, value)
+                    yield item.value
+                    item = None
+            elif item is not None:
+                if selected:
+                    item.event(event, value)
+            elif prefix in ("data.count", "data.total"):
+                meta[prefix[len("data.") :]] = value
 
     @staticmethod
     def extract_data(response_json):
@@ -34,10 +114,14 @@ class BaseParser(abc.ABC):
                 return url
         return ""
 
+    @staticmethod
+    def extract_name(result):
+        return result.get("name", result.get("title", ""))
+
     @classmethod
     def extract_base_features(cls, result):
         _id = result["id"]
-        name = result.get("name", result.get("title", ""))
+        name = cls.extract_name(result)
         description = result.get("description", "")
         if not description:
             description = result.get("variantDescription", "")
@@ -45,7 +129,7 @@ class BaseParser(abc.ABC):
             description = f"Sorry, I did not found description for {name} :("
 
         thumbnail = result.get("thumbnail", dict(path="", extension=""))
-        img_link = f"{thumbnail['path']}.{thumbnail['extension']}"
+        img_link = intern(f"{thumbnail['path']}.{thumbnail['extension']}")
 
         resource_uri = result.get("resourceURI", "")
         detail = cls.extract_public_link(result, "detail")
@@ -56,6 +140,8 @@ class BaseParser(abc.ABC):
             "img_link": img_link,
             "detail": detail,
             "_resource_uri": resource_uri,
+            # changes whenever Marvel edits the entity
+            "modified": intern(result.get("modified", "")),
         }
         return base_features
 
@@ -71,7 +157,10 @@ class BaseParser(abc.ABC):
 
 
 class ParsedEntities:
-    def __init__(self, entities=None, count=0, total=0):
+    def __init__(self, entities=None, count=0, total=0, etag=None, nbytes=0):
         self.entities = entities if entities else []
         self.count = count
         self.total = total
+        self.etag = etag
+        # length of the response body, 0 when not known
+        self.nbytes = nbytes
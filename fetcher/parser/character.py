@@ -1,7 +1,11 @@
+from fetcher.entities import CharacterEntity, LazyCharacterEntity
 from fetcher.parser.base_parser import BaseParser
 
 
 class CharacterParser(BaseParser):
+    ENTITY = CharacterEntity
+    LAZY_ENTITY = LazyCharacterEntity
+
     @classmethod
     def extract_custom_features(cls, result):
         return {"wiki": cls.extract_public_link(result, {})}
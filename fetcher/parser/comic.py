@@ -1,8 +1,12 @@
-from fetcher.entities import Creator
+from fetcher.entities import Creator, ComicEntity, LazyComicEntity
 from fetcher.parser.base_parser import BaseParser
 
 
 class ComicParser(BaseParser):
+    ENTITY = ComicEntity
+    LAZY_ENTITY = LazyComicEntity
+    CUSTOM_FIELDS = ("pageCount", "creators")
+
     @classmethod
     def extract_custom_features(cls, result):
         page_count = result["pageCount"]
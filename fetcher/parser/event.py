@@ -1,7 +1,12 @@
+from fetcher.entities import EventEntity, LazyEventEntity
 from fetcher.parser.base_parser import BaseParser
 
 
 class EventParser(BaseParser):
+    ENTITY = EventEntity
+    LAZY_ENTITY = LazyEventEntity
+    CUSTOM_FIELDS = ("start", "end", "next", "previous")
+
     @classmethod
     def extract_custom_features(cls, result):
 
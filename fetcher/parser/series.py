@@ -1,7 +1,12 @@
+from fetcher.entities import SeriesEntity, LazySeriesEntity
 from fetcher.parser.base_parser import BaseParser
 
 
 class SeriesParser(BaseParser):
+    ENTITY = SeriesEntity
+    LAZY_ENTITY = LazySeriesEntity
+    CUSTOM_FIELDS = ("startYear", "endYear", "next", "previous")
+
     @classmethod
     def extract_custom_features(cls, result):
         return {
@@ -0,0 +1,120 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from fetcher.quota import Priority
+
+
+class Prefetcher:
+    MAX_TRACKED_KEYS = 10000
+
+    def __init__(self, fetcher, workers, daily_budget):
+        self._fetcher = fetcher
+        self._executor = ThreadPoolExecutor(
+            workers, thread_name_prefix="prefetch"
+        )
+        self.daily_budget = daily_budget
+        self._day = None
+        self._spent = 0
+        self._tasks = {}
+        # keys of scheduled prefetches which are not done yet
+        self._pending = set()
+        self._prefetched = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.scheduled = 0
+        self.skipped_cached = 0
+        self.skipped_pending = 0
+        self.skipped_budget = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.hits = 0
+
+    def _take_budget(self):
+        today = time.gmtime()[:3]
+        if today != self._day:
+            self._day = today
+            self._spent = 0
+        if self._spent >= self.daily_budget:
+            return False
+        self._spent += 1
+        return True
+
+    def prefetch(self, owner, route, **kwargs):
+        key = self._fetcher.cache_key(route, kwargs)
+        if self._fetcher.cache.fresh(key):
+            with self._lock:
+                self.skipped_cached += 1
+            return
+
+        with self._lock:
+            if key in self._pending:
+                self.skipped_pending += 1
+                return
+            if not self._take_budget():
+                self.skipped_budget += 1
+                return
+            self.scheduled += 1
+            self._pending.add(key)
+            future = self._executor.submit(self._run, key, route, kwargs)
+            self._tasks.setdefault(owner, set()).add(future)
+        future.add_done_callback(lambda f: self._discard(owner, key, f))
+
+    def _run(self, key, route, kwargs):
+        try:
+            self._fetcher.list_entities(route, Priority.PREFETCH, **kwargs)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            return
+
+        with self._lock:
+            self.completed += 1
+            self._prefetched[key] = None
+            if len(self._prefetched) > self.MAX_TRACKED_KEYS:
+                self._prefetched.popitem(last=False)
+
+    def _discard(self, owner, key, future):
+        with self._lock:
+            self._pending.discard(key)
+            tasks = self._tasks.get(owner)
+            if tasks is not None:
+                tasks.discard(future)
+                if not tasks:
+                    del self._tasks[owner]
+
+    def cancel(self, owner):
+        with self._lock:
+            tasks = self._tasks.pop(owner, set())
+        for future in tasks:
+            if future.cancel():
+                with self._lock:
+                    self.cancelled += 1
+
+    def used(self, key):
+        with self._lock:
+            if key in self._prefetched:
+                del self._prefetched[key]
+                self.hits += 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "scheduled": self.scheduled,
+                "skipped_cached": self.skipped_cached,
+                "skipped_pending": self.skipped_pending,
+                "skipped_budget": self.skipped_budget,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "hits": self.hits,
+                "hit_rate": (
+                    self.hits / self.completed if self.completed else 0
+                ),
+                "budget_left": max(self.daily_budget - self._spent, 0),
+            }
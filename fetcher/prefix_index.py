@@ -0,0 +1,62 @@
+import bisect
+
+from fetcher.mirror import Mirror, EXACT_FILTERS, PREFIX_FILTERS, PREFIX_END
+from fetcher.parser.base_parser import ParsedEntities
+
+
+class PrefixIndex:
+    def __init__(self, entities):
+        entities = sorted(
+            entities,
+            key=lambda entity: (Mirror.name_key(entity.name), entity._id),
+        )
+        self._keys = [Mirror.name_key(entity.name) for entity in entities]
+        self._entities = entities
+
+    @classmethod
+    def from_mirror(cls, mirror, route, parser):
+        results = list(mirror.iter_raw(route))
+        parsed_entities = parser.parse(
+            {
+                "data": {
+                    "results": results,
+                    "count": len(results),
+                    "total": len(results),
+                }
+            },
+            mirror.lazy,
+        )
+        return cls(parsed_entities.entities)
+
+    def __len__(self):
+        return len(self._entities)
+
+    def __iter__(self):
+        return iter(self._entities)
+
+    def bounds(self, value=None, exact=False):
+        if value is None:
+            return 0, len(self._keys)
+
+        key = Mirror.name_key(value)
+        start = bisect.bisect_left(self._keys, key)
+        if exact:
+            end = bisect.bisect_right(self._keys, key, start)
+        else:
+            end = bisect.bisect_left(self._keys, key + PREFIX_END, start)
+        return start, end
+
+    def list_entities(self, limit=20, offset=0, **kwargs):
+        value, exact = None, False
+        for key, filter_value in kwargs.items():
+            if key in EXACT_FILTERS:
+                value, exact = filter_value, True
+            elif key in PREFIX_FILTERS:
+                value = filter_value
+
+        start, end = self.bounds(value, exact)
+        page_start = min(start + int(offset), end)
+        entities = self._entities[
+            page_start : min(page_start + int(limit), end)
+        ]
+        return ParsedEntities(entities, len(entities), end - start)
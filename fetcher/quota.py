@@ -0,0 +1,151 @@
+import time
+import datetime
+import threading
+
+from enum import IntEnum
+
+from fetcher.exceptions import QuotaExceeded
+
+DAY = 24 * 60 * 60
+
+
+class Priority(IntEnum):
+    USER = 0
+    PREFETCH = 1
+    CRAWL = 2
+
+
+class QuotaScheduler:
+    # pause after an upstream 429 without Retry-After, in seconds
+    THROTTLE_PAUSE = 1.0
+    # share of the daily budget which must be left to serve a priority
+    RESERVES = {
+        Priority.USER: 0.0,
+        Priority.PREFETCH: 0.2,
+        Priority.CRAWL: 0.5,
+    }
+
+    def __init__(self, daily_budget, rate, burst, max_wait):
+        self.daily_budget = daily_budget
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._day_start = None
+        self._used = 0
+        self.used_by = {priority: 0 for priority in Priority}
+        self.dropped = {priority: 0 for priority in Priority}
+        self.throttled_count = 0
+        self._roll_day()
+
+    def _roll_day(self):
+        now = time.time()
+        day_start = now - now % DAY
+        if day_start != self._day_start:
+            self._day_start = day_start
+            self._used = 0
+            for priority in Priority:
+                self.used_by[priority] = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def _drop(self, priority, reason):
+        self.dropped[priority] += 1
+        raise QuotaExceeded(
+            f"{priority.name.lower()} request dropped: {reason}", priority
+        )
+
+    def acquire(self, priority=Priority.USER):
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            with self._lock:
+                self._roll_day()
+                remaining = self.daily_budget - self._used
+                if remaining <= self.daily_budget * self.RESERVES[priority]:
+                    self._drop(priority, "daily budget is spent")
+
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self._used += 1
+                    self.used_by[priority] += 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+                if priority == Priority.PREFETCH:
+                    self._drop(priority, "rate limit")
+                if (
+                    priority == Priority.USER
+                    and time.monotonic() + wait > deadline
+                ):
+                    self._drop(priority, "rate limit")
+            time.sleep(wait)
+
+    def throttled(self, retry_after=None):
+        # the bucket goes below zero, so the next request waits out the pause
+        pause = self.THROTTLE_PAUSE if retry_after is None else retry_after
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -pause * self.rate)
+            self.throttled_count += 1
+
+    def rate_limited(self, body, retry_after=None):
+        # a 429 usually means too many requests per second, only a body
+        # mentioning the daily limit spends the rest of the budget
+        if "daily" in body.lower():
+            self.exhausted()
+            return
+        try:
+            retry_after = float(retry_after)
+        except (TypeError, ValueError):
+            retry_after = None
+        self.throttled(retry_after)
+
+    def exhausted(self):
+        with self._lock:
+            self._roll_day()
+            self._used = max(self._used, self.daily_budget)
+
+    def forecast(self):
+        with self._lock:
+            self._roll_day()
+            now = time.time()
+            remaining = self.daily_budget - self._used
+            elapsed = now - self._day_start
+            if remaining <= 0:
+                return now
+            if not self._used or not elapsed:
+                return None
+            runs_out = now + remaining / (self._used / elapsed)
+            return runs_out if runs_out < self._day_start + DAY else None
+
+    def state(self):
+        runs_out = self.forecast()
+        with self._lock:
+            return {
+                "daily_budget": self.daily_budget,
+                "used": self._used,
+                "remaining": max(self.daily_budget - self._used, 0),
+                "used_by": {
+                    priority.name.lower(): used
+                    for priority, used in self.used_by.items()
+                },
+                "dropped": {
+                    priority.name.lower(): dropped
+                    for priority, dropped in self.dropped.items()
+                },
+                "throttled": self.throttled_count,
+                "resets_at": _utc(self._day_start + DAY),
+                "runs_out_at": _utc(runs_out) if runs_out else None,
+            }
+
+
+def _utc(timestamp):
+    return datetime.datetime.utcfromtimestamp(int(timestamp)).isoformat()
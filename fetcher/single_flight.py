@@ -0,0 +1,64 @@
+import threading
+
+from fetcher.exceptions import FetcherException
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.collapsed = 0
+        self.timeouts = 0
+
+    def do(self, key, function, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.collapsed += 1
+
+        if leader:
+            try:
+                call.result = function(*args, **kwargs)
+            except Exception as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result
+
+        if not call.done.wait(self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise FetcherException(
+                None, "Timed out waiting for in-flight request"
+            )
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "calls": self.calls,
+                "collapsed": self.collapsed,
+                "timeouts": self.timeouts,
+            }
@@ -2,9 +2,11 @@ from .comics import ComicsConversationHandler
 from .events import EventsConversationHandler
 from .series import SeriesConversationHandler
 from .characters import CharactersConversationHandler
+from .conversation_handler_builder import ConversationHandlerBuilder
 
 
 __all__ = [
+    "ConversationHandlerBuilder",
     "CharactersConversationHandler",
     "ComicsConversationHandler",
     "EventsConversationHandler",
@@ -0,0 +1,50 @@
+import re
+
+from telegram import Update
+from telegram.ext import CallbackQueryHandler
+
+# patterns like ^NEXT_PAGE$ match exactly one callback data
+LITERAL_PATTERN = re.compile(r"\^([\w-]+)\$")
+
+
+# one handler for a whole state: literal patterns are looked up in a dict,
+# other patterns are tried in order, so the first matching pattern of the
+# map wins exactly as with a CallbackQueryHandler per pattern
+class CallbackRouter(CallbackQueryHandler):
+    def __init__(self, pattern_handler_map):
+        super().__init__(None)
+        self.literals = {}
+        self.regexes = []
+        for index, (pattern, handler) in enumerate(
+            pattern_handler_map.items()
+        ):
+            compiled = re.compile(pattern)
+            literal = LITERAL_PATTERN.fullmatch(pattern)
+            if literal:
+                self.literals[literal.group(1)] = (index, compiled, handler)
+            else:
+                self.regexes.append((index, compiled, handler))
+
+    def check_update(self, update):
+        if not isinstance(update, Update) or not update.callback_query:
+            return None
+        data = update.callback_query.data
+        if not data:
+            return None
+        # $ also matches before a trailing newline
+        literal = self.literals.get(data[:-1] if data[-1] == "\n" else data)
+        for index, pattern, handler in self.regexes:
+            if literal and literal[0] < index:
+                break
+            match = pattern.match(data)
+            if match:
+                return handler, match
+        if literal:
+            _, pattern, handler = literal
+            return handler, pattern.match(data)
+        return None
+
+    def handle_update(self, update, dispatcher, check_result, context=None):
+        handler, match = check_result
+        context.matches = [match]
+        return handler(update, context)
@@ -10,9 +10,14 @@ from telegram.ext import (
 
 from states import States
 from handlers.entity_handlers import MiscHandler
+from handlers.conversation_handlers.callback_router import CallbackRouter
 
 
 class ConversationHandlerBuilder:
+    # resolve callback data of a state by CallbackRouter instead of trying
+    # a CallbackQueryHandler per pattern
+    COMPILED_ROUTING = True
+
     @classmethod
     def build_inner_conversation_handler(
         cls, entrypoint_map, state_pattern_handler_maps, save_input
@@ -42,8 +47,10 @@ class ConversationHandlerBuilder:
         )
         return handler
 
-    @staticmethod
-    def _handlers_from_dict(pattern_handler_map):
+    @classmethod
+    def _handlers_from_dict(cls, pattern_handler_map):
+        if cls.COMPILED_ROUTING:
+            return [CallbackRouter(pattern_handler_map)]
         return [
             CallbackQueryHandler(handler, pattern=pattern)
             for pattern, handler in pattern_handler_map.items()
@@ -12,8 +12,9 @@ from constants import (
     DATA,
     INPUT_FOR,
     FETCHER,
+    RENDERS,
     OFFSET,
-    FEATURES,
+    PAGE_OFFSET,
     LIMIT,
     MSG_DELETED,
 )
@@ -21,8 +22,17 @@ from constants import (
 
 class BaseHandler(abc.ABC):
     @staticmethod
-    def _inner_menu(update: Update, context: CallbackContext, text, keyboard):
+    def leave_page(update: Update, context: CallbackContext):
+        fetcher = context.bot_data[FETCHER]
+        fetcher.cancel_prefetch(update.effective_chat.id)
+        fetcher.entities.unpin(update.effective_chat.id)
+
+    @classmethod
+    def _inner_menu(
+        cls, update: Update, context: CallbackContext, text, keyboard
+    ):
         context.chat_data[OFFSET] = 0
+        cls.leave_page(update, context)
 
         if context.chat_data.get(DATA):
             del context.chat_data[DATA]
@@ -43,7 +53,7 @@ class BaseHandler(abc.ABC):
 
     @classmethod
     def _list_(cls, update: Update, context: CallbackContext, route):
-        text, keyboard = cls._request_entities(context, route, LIMIT)
+        text, keyboard = cls._request_entities(update, context, route, LIMIT)
         update.callback_query.answer()
         update.callback_query.edit_message_text(
             text=text, reply_markup=keyboard
@@ -52,9 +62,8 @@ class BaseHandler(abc.ABC):
 
     @classmethod
     def _list_previous(cls, context: CallbackContext):
-        current_offset = context.chat_data[OFFSET]
-        subtract_value = LIMIT + (current_offset % 10 or LIMIT)
-        context.chat_data[OFFSET] -= subtract_value
+        page_offset = context.chat_data.get(PAGE_OFFSET, 0)
+        context.chat_data[OFFSET] = max(page_offset - LIMIT, 0)
 
     @classmethod
     def _find_by_name(
@@ -73,7 +82,7 @@ class BaseHandler(abc.ABC):
             return cls.ask_for_input(update, context)
 
         text, keyboard = cls._request_entities(
-            context, route, LIMIT, **{filter_key: value}
+            update, context, route, LIMIT, **{filter_key: value}
         )
         if text != Text.error:
             if not keyboard:
@@ -98,7 +107,7 @@ class BaseHandler(abc.ABC):
         return return_state
 
     @classmethod
-    def _request_entities(cls, context, route, limit, **kwargs):
+    def _request_entities(cls, update, context, route, limit, **kwargs):
 
         fetcher = context.bot_data[FETCHER]
         offset = context.chat_data.get(OFFSET, 0)
@@ -107,20 +116,31 @@ class BaseHandler(abc.ABC):
                 route, limit=limit, offset=offset, **kwargs
             )
             has_more_pages = limit + offset < fetched_data.total
+            if has_more_pages:
+                fetcher.prefetch(
+                    update.effective_chat.id,
+                    route,
+                    limit=limit,
+                    offset=offset + limit,
+                    **kwargs,
+                )
 
             entities = fetched_data.entities
-            context.chat_data[FEATURES] = entities
+            ids = [entity._id for entity in entities]
+            fetcher.entities.pin(update.effective_chat.id, route, ids)
 
-            sorted_entities = sorted(
-                [
-                    getattr(entity, "name", getattr(entity, "title", ""))
-                    for entity in entities
-                ]
+            names = tuple(
+                getattr(entity, "name", getattr(entity, "title", ""))
+                for entity in entities
             )
-            keyboard = CustomKeyboard.keyboard_from_iterable(
-                sorted_entities, bool(offset), has_more_pages
+            text, keyboard = cls._render_page(
+                context.bot_data[RENDERS],
+                (route, tuple(sorted(kwargs.items())), offset),
+                ids,
+                names,
+                has_more_pages,
             )
-            text = Text.from_container(sorted_entities)
+            context.chat_data[PAGE_OFFSET] = offset
             context.chat_data[OFFSET] = offset + min(limit, fetched_data.count)
         except Exception:
             traceback.print_exc(file=sys.stderr)
@@ -128,6 +148,32 @@ class BaseHandler(abc.ABC):
             keyboard = CustomKeyboard.main_menu
         return text, keyboard
 
+    @staticmethod
+    def _render_page(renders, page, ids, names, has_more_pages):
+        # page is (route, query, offset), text and keyboard depend only on
+        # it and on entities of the page
+        route, _, offset = page
+        prev_required = bool(offset)
+        key = (*page, prev_required, has_more_pages)
+        version = (tuple(ids), names)
+        rendered = renders.get(key, version)
+        if rendered is None:
+            sorted_entities = sorted(
+                zip(
+                    names,
+                    [CustomKeyboard.entity_data(route, _id) for _id in ids],
+                )
+            )
+            keyboard = CustomKeyboard.keyboard_from_iterable(
+                sorted_entities, prev_required, has_more_pages
+            )
+            text = Text.from_container(
+                [name for name, _ in sorted_entities]
+            )
+            rendered = (text, keyboard)
+            renders.put(key, version, rendered)
+        return rendered
+
     @classmethod
     def save_input(cls, update: Update, context: CallbackContext) -> str:
         context.chat_data[DATA] = update.message.text
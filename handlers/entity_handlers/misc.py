@@ -3,8 +3,19 @@ from telegram.ext import CallbackContext
 
 from text import Text
 from states import States
-from constants import OFFSET, START_OVER
+from constants import (
+    FETCHER,
+    FILE_IDS,
+    THUMBNAILS,
+    RENDERS,
+    CAPTIONS,
+    WEBHOOK,
+    DISPATCHER,
+    OFFSET,
+    START_OVER,
+)
 from visualization.custom_keyboard import CustomKeyboard
+from handlers.entity_handlers.base_handler import BaseHandler
 
 
 class MiscHandler:
@@ -27,18 +38,36 @@ class MiscHandler:
 
     @classmethod
     def end_second_level(cls, update: Update, context: CallbackContext):
+        BaseHandler.leave_page(update, context)
         context.chat_data[OFFSET] = 0
         context.chat_data[START_OVER] = True
         cls.start(update, context)
         return States.END.value
 
     @classmethod
-    def stop(cls, update: Update, _: CallbackContext):
+    def stop(cls, update: Update, context: CallbackContext):
+        BaseHandler.leave_page(update, context)
         update.message.reply_text(Text.stop)
         return States.END.value
 
     @classmethod
-    def end(cls, update: Update, _: CallbackContext):
+    def end(cls, update: Update, context: CallbackContext):
+        BaseHandler.leave_page(update, context)
         update.callback_query.answer()
         update.callback_query.edit_message_text(text=Text.end)
         return States.END.value
+
+    @classmethod
+    def stats(cls, update: Update, context: CallbackContext):
+        stats = context.bot_data[FETCHER].stats()
+        for key in (
+            FILE_IDS,
+            THUMBNAILS,
+            RENDERS,
+            CAPTIONS,
+            WEBHOOK,
+            DISPATCHER,
+        ):
+            if context.bot_data.get(key):
+                stats[key.lower()] = context.bot_data[key].stats()
+        update.message.reply_text(Text.stats(stats) or Text.error)
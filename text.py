@@ -49,6 +49,17 @@ class _Text:
     def from_container(container, sep="\n"):
         return sep.join(container)
 
+    @classmethod
+    def stats(cls, stats, indent=""):
+        lines = []
+        for key, value in stats.items():
+            if isinstance(value, dict):
+                lines.append(f"{indent}{key}:")
+                lines.append(cls.stats(value, indent + "  "))
+            else:
+                lines.append(f"{indent}{key}: {value}")
+        return cls.from_container(lines)
+
 
 class Text(_Text):
     menu = _Text.menu()
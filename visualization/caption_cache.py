@@ -0,0 +1,49 @@
+import threading
+from collections import OrderedDict
+
+
+# captions of opened entities keyed by (route, id, modified), an edited
+# entity gets a new key and its old caption is evicted eventually
+class CaptionCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._captions = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            caption = self._captions.get(key)
+            if caption is None:
+                self.misses += 1
+            else:
+                self._captions.move_to_end(key)
+                self.hits += 1
+            return caption
+
+    def put(self, key, caption):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._captions[key] = caption
+            self._captions.move_to_end(key)
+            while len(self._captions) > self.max_size:
+                self._captions.popitem(last=False)
+                self.evictions += 1
+
+    def full(self):
+        with self._lock:
+            return len(self._captions) >= self.max_size
+
+    def stats(self):
+        with self._lock:
+            return {
+                "captions": len(self._captions),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -6,6 +6,7 @@ from states import States
 class _CustomKeyboard:
 
     CALLBACK_DATA_MAX_LENGTH = 64
+    ENTITY_DATA_SEPARATOR = "/"
 
     @staticmethod
     def main_menu():
@@ -104,6 +105,17 @@ class _CustomKeyboard:
             States.FIND_SERIES_BY_TITLE_BEGINNING.value,
         )
 
+    @classmethod
+    def entity_data(cls, route, _id):
+        return f"{int(route)}{cls.ENTITY_DATA_SEPARATOR}{_id}"
+
+    @classmethod
+    def parse_entity_data(cls, data):
+        route, separator, _id = data.partition(cls.ENTITY_DATA_SEPARATOR)
+        if not separator or not route.isdigit() or not _id.isdigit():
+            return None
+        return int(route), int(_id)
+
     @classmethod
     def keyboard_from_iterable(cls, iterable, prev_required, next_required):
         if not iterable:
@@ -111,11 +123,13 @@ class _CustomKeyboard:
         buttons = [
             [
                 InlineKeyboardButton(
-                    text=item,
-                    callback_data=item[: cls.CALLBACK_DATA_MAX_LENGTH],
+                    text=text,
+                    callback_data=callback_data[
+                        : cls.CALLBACK_DATA_MAX_LENGTH
+                    ],
                 )
             ]
-            for item in iterable
+            for text, callback_data in iterable
         ]
         page_buttons = []
         if prev_required:
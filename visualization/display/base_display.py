@@ -1,26 +1,43 @@
 import abc
+import sys
+import time
+import traceback
 
 from telegram import Update
+from telegram.error import BadRequest
 from telegram.ext import CallbackContext
 
-from constants import FEATURES, OFFSET, MSG_DELETED
+from constants import (
+    FETCHER,
+    FILE_IDS,
+    THUMBNAILS,
+    CAPTIONS,
+    OFFSET,
+    MSG_DELETED,
+)
+from visualization.custom_keyboard import CustomKeyboard
 
 
 class BaseDisplay(abc.ABC):
-    CALLBACK_DATA_MAX_LENGTH = 64
     CAPTION_MAX_LENGTH = 1024
+    ROUTE = None
 
     @classmethod
     def extract_entity(cls, update, context):
-        entity = None
-        for entity_ in context.chat_data[FEATURES]:
-            length_limited_name = entity_.name[
-                : cls.CALLBACK_DATA_MAX_LENGTH
-            ]
-            if length_limited_name == update.callback_query.data:
-                entity = entity_
-                break
-        return entity
+        # callback data carries route and id, so the entity is found in the
+        # shared store or fetched by id even when the page state is gone
+        entity_data = CustomKeyboard.parse_entity_data(
+            update.callback_query.data
+        )
+        if entity_data is None:
+            return None
+
+        fetcher = context.bot_data[FETCHER]
+        try:
+            return fetcher.get_entity(*entity_data)
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+            return None
 
     @classmethod
     def send_entity(cls, update, context):
@@ -28,16 +45,79 @@ class BaseDisplay(abc.ABC):
 
         entity = cls.extract_entity(update, context)
         if entity:
-            caption = cls.extract_content(entity)
-            context.bot.send_photo(
+            caption = cls.caption(context.bot_data.get(CAPTIONS), entity)
+            cls.send_photo(
+                context,
                 update.callback_query.message.chat_id,
                 entity.img_link,
-                caption=caption,
+                caption,
             )
 
         update.callback_query.delete_message()
         context.chat_data[MSG_DELETED] = True
 
+    @classmethod
+    def caption(cls, captions, entity):
+        # entities without modification date can not be told apart from
+        # their edited versions, so they are not cached
+        if captions is None or not entity.modified:
+            return cls.extract_content(entity)[: cls.CAPTION_MAX_LENGTH]
+        key = (int(cls.ROUTE), entity._id, entity.modified)
+        caption = captions.get(key)
+        if caption is None:
+            caption = cls.extract_content(entity)[: cls.CAPTION_MAX_LENGTH]
+            captions.put(key, caption)
+        return caption
+
+    @classmethod
+    def send_photo(cls, context, chat_id, img_link, caption):
+        thumbnails = context.bot_data.get(THUMBNAILS)
+        url = thumbnails.url(img_link) if thumbnails else img_link
+        file_ids = context.bot_data.get(FILE_IDS)
+        if file_ids is None:
+            return cls._send_photo_file(
+                context, chat_id, url, caption, thumbnails
+            )
+
+        # telegram keeps uploaded photos, so sending by file_id skips the
+        # download from Marvel CDN
+        file_id = file_ids.get(url)
+        start = time.perf_counter()
+        if file_id:
+            try:
+                message = context.bot.send_photo(
+                    chat_id, file_id, caption=caption
+                )
+                file_ids.sent(True, time.perf_counter() - start)
+                return message
+            except BadRequest:
+                traceback.print_exc(file=sys.stderr)
+                file_ids.invalidate(url)
+                start = time.perf_counter()
+
+        message = cls._send_photo_file(
+            context, chat_id, url, caption, thumbnails
+        )
+        file_ids.sent(False, time.perf_counter() - start)
+        if message.photo:
+            file_ids.put(url, message.photo[-1].file_id)
+        return message
+
+    @staticmethod
+    def _send_photo_file(context, chat_id, url, caption, thumbnails):
+        content = thumbnails.cached(url) if thumbnails else None
+        if content is None:
+            try:
+                return context.bot.send_photo(chat_id, url, caption=caption)
+            except BadRequest:
+                # telegram could not download the image in time, upload it
+                # from here instead
+                if thumbnails is None:
+                    raise
+                traceback.print_exc(file=sys.stderr)
+                content = thumbnails.download(url)
+        return context.bot.send_photo(chat_id, content, caption=caption)
+
     @classmethod
     @abc.abstractmethod
     def extract_content(cls, entity):
@@ -1,11 +1,14 @@
 from telegram import Update
 from telegram.ext import CallbackContext
 
+from fetcher import Route
 from handlers.entity_handlers import CharactersHandler
 from visualization.display.base_display import BaseDisplay
 
 
 class CharactersDisplay(BaseDisplay):
+    ROUTE = Route.CHARACTERS
+
     @classmethod
     def extract_content(cls, character):
         ch_name = character.name
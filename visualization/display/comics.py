@@ -1,11 +1,14 @@
 from telegram import Update
 from telegram.ext import CallbackContext
 
+from fetcher import Route
 from handlers.entity_handlers import ComicsHandler
 from visualization.display.base_display import BaseDisplay
 
 
 class ComicsDisplay(BaseDisplay):
+    ROUTE = Route.COMICS
+
     @classmethod
     def extract_content(cls, comic):
         page_count = f"Page count: {comic.page_count if comic.page_count else 'Unknown'}"
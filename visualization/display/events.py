@@ -1,11 +1,14 @@
 from telegram import Update
 from telegram.ext import CallbackContext
 
+from fetcher import Route
 from handlers.entity_handlers import EventsHandler
 from visualization.display.base_display import BaseDisplay
 
 
 class EventsDisplay(BaseDisplay):
+    ROUTE = Route.EVENTS
+
     @classmethod
     def extract_content(cls, event):
         ev_name = event.name
@@ -1,11 +1,14 @@
 from telegram import Update
 from telegram.ext import CallbackContext
 
+from fetcher import Route
 from handlers.entity_handlers import SeriesHandler
 from visualization.display.base_display import BaseDisplay
 
 
 class SeriesDisplay(BaseDisplay):
+    ROUTE = Route.SERIES
+
     @classmethod
     def extract_content(cls, single_series):
         detail = f"detail link: {single_series.detail}"
@@ -0,0 +1,143 @@
+import time
+import sqlite3
+import threading
+
+
+class FileIdCache:
+    # access times of hits are kept in memory and written in batches, so a
+    # photo sent by file_id does not wait for a commit
+    FLUSH_SIZE = 1000
+    FLUSH_INTERVAL = 60
+
+    def __init__(self, path, max_size):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._accessed = {}
+        self._flushed = time.monotonic()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS file_ids ("
+            "url TEXT PRIMARY KEY, file_id TEXT, accessed REAL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS file_ids_accessed "
+            "ON file_ids (accessed)"
+        )
+        self._connection.commit()
+        (self._size,) = self._connection.execute(
+            "SELECT COUNT(*) FROM file_ids"
+        ).fetchone()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._sends = {True: 0, False: 0}
+        self._send_time = {True: 0.0, False: 0.0}
+        self._send_max = {True: 0.0, False: 0.0}
+
+    def get(self, url):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT file_id FROM file_ids WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._accessed[url] = time.time()
+            if (
+                len(self._accessed) >= self.FLUSH_SIZE
+                or time.monotonic() - self._flushed >= self.FLUSH_INTERVAL
+            ):
+                self._flush()
+                self._connection.commit()
+            return row[0]
+
+    def _flush(self):
+        self._connection.executemany(
+            "UPDATE file_ids SET accessed = ? WHERE url = ?",
+            ((accessed, url) for url, accessed in self._accessed.items()),
+        )
+        self._accessed.clear()
+        self._flushed = time.monotonic()
+
+    def put(self, url, file_id):
+        if not self.max_size:
+            return
+
+        with self._lock:
+            self._accessed.pop(url, None)
+            cursor = self._connection.execute(
+                "UPDATE file_ids SET file_id = ?, accessed = ? WHERE url = ?",
+                (file_id, time.time(), url),
+            )
+            if not cursor.rowcount:
+                self._connection.execute(
+                    "INSERT INTO file_ids VALUES (?, ?, ?)",
+                    (url, file_id, time.time()),
+                )
+                self._size += 1
+                self._evict()
+            self._connection.commit()
+
+    def invalidate(self, url):
+        with self._lock:
+            self._accessed.pop(url, None)
+            cursor = self._connection.execute(
+                "DELETE FROM file_ids WHERE url = ?", (url,)
+            )
+            self._size -= cursor.rowcount
+            self.invalidations += 1
+            self._connection.commit()
+
+    def _evict(self):
+        if self._size > self.max_size:
+            # least recently sent is decided by the latest access times
+            self._flush()
+        while self._size > self.max_size:
+            (url,) = self._connection.execute(
+                "SELECT url FROM file_ids ORDER BY accessed LIMIT 1"
+            ).fetchone()
+            self._connection.execute(
+                "DELETE FROM file_ids WHERE url = ?", (url,)
+            )
+            self._size -= 1
+            self.evictions += 1
+
+    def sent(self, cached, seconds):
+        with self._lock:
+            self._sends[cached] += 1
+            self._send_time[cached] += seconds
+            self._send_max[cached] = max(self._send_max[cached], seconds)
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._connection.commit()
+            self._connection.close()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "size": self._size,
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+            for cached, name in ((True, "file_id"), (False, "url")):
+                sends = self._sends[cached]
+                stats[f"{name}_sends"] = sends
+                stats[f"{name}_send_avg_ms"] = (
+                    round(self._send_time[cached] / sends * 1000, 1)
+                    if sends
+                    else 0
+                )
+                stats[f"{name}_send_max_ms"] = round(
+                    self._send_max[cached] * 1000, 1
+                )
+            return stats
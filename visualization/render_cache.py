@@ -0,0 +1,53 @@
+import threading
+from collections import OrderedDict
+
+
+# text and keyboard of listing pages shared between chats, an entry is
+# served only while the page still holds the same entities, so refreshed
+# Marvel API data is rendered again
+class RenderCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._pages.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] != version:
+                del self._pages[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, rendered):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._pages[key] = (version, rendered)
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_size:
+                self._pages.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pages": len(self._pages),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
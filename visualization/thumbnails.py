@@ -0,0 +1,125 @@
+import os
+import hashlib
+import threading
+
+import requests
+
+
+class Thumbnails:
+    # https://developer.marvel.com/documentation/images
+    VARIANTS = (
+        "portrait_small",
+        "portrait_medium",
+        "portrait_xlarge",
+        "portrait_fantastic",
+        "portrait_uncanny",
+        "portrait_incredible",
+        "detail",
+    )
+
+    def __init__(self, variant, path=None, max_bytes=0, timeout=None):
+        self.variant = variant
+        self.path = path
+        self.max_bytes = max_bytes
+        self._timeout = timeout
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+        self._files = {}
+        if path:
+            os.makedirs(path, exist_ok=True)
+            for entry in sorted(
+                os.scandir(path), key=lambda entry: entry.stat().st_mtime
+            ):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    self._files[entry.name] = entry.stat().st_size
+        self._size = sum(self._files.values())
+
+        self.hits = 0
+        self.misses = 0
+        self.downloads = 0
+        self.downloaded_bytes = 0
+        self.evictions = 0
+
+    @staticmethod
+    def variant_url(img_link, variant):
+        path, dot, extension = img_link.rpartition(".")
+        if not variant or not dot or not path:
+            return img_link
+        return f"{path}/{variant}.{extension}"
+
+    def url(self, img_link):
+        return self.variant_url(img_link, self.variant)
+
+    @staticmethod
+    def _file_name(url):
+        extension = os.path.splitext(url)[1]
+        return hashlib.sha1(url.encode("utf-8")).hexdigest() + extension
+
+    def cached(self, url):
+        if not self.path:
+            return None
+
+        name = self._file_name(url)
+        with self._lock:
+            if name not in self._files:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # dict order is the eviction order, most recently used last
+            self._files[name] = self._files.pop(name)
+        file_path = os.path.join(self.path, name)
+        try:
+            with open(file_path, "rb") as image:
+                content = image.read()
+        except OSError:
+            return None
+        os.utime(file_path)
+        return content
+
+    def download(self, url):
+        response = self._session.get(url, timeout=self._timeout)
+        response.raise_for_status()
+        content = response.content
+        with self._lock:
+            self.downloads += 1
+            self.downloaded_bytes += len(content)
+        if self.path and len(content) <= self.max_bytes:
+            self._store(url, content)
+        return content
+
+    def _store(self, url, content):
+        name = self._file_name(url)
+        file_path = os.path.join(self.path, name)
+        temp_path = f"{file_path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as image:
+            image.write(content)
+        os.replace(temp_path, file_path)
+
+        with self._lock:
+            self._size += len(content) - self._files.pop(name, 0)
+            self._files[name] = len(content)
+            while self._size > self.max_bytes:
+                evicted = next(iter(self._files))
+                self._size -= self._files.pop(evicted)
+                self.evictions += 1
+                try:
+                    os.remove(os.path.join(self.path, evicted))
+                except OSError:
+                    pass
+
+    def close(self):
+        self._session.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "variant": self.variant or "original",
+                "files": len(self._files),
+                "size": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "downloads": self.downloads,
+                "downloaded_bytes": self.downloaded_bytes,
+                "evictions": self.evictions,
+            }
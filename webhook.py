@@ -0,0 +1,165 @@
+import ssl
+import hmac
+import json
+import queue
+import signal
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from telegram import Update
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    # telegram opens up to max_connections (40 by default) at once
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class WebhookServer:
+    SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+    # updates are a few KiB, the largest ones carry long texts and entities
+    MAX_BODY_SIZE = 1024 * 1024
+
+    def __init__(
+        self,
+        dispatcher,
+        listen,
+        port,
+        path,
+        secret,
+        cert=None,
+        key=None,
+    ):
+        self.dispatcher = dispatcher
+        self.path = path or "/"
+        self._secret = secret
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._threads = []
+
+        self.received = 0
+        self.rejected = 0
+        self.dropped = 0
+
+        self._httpd = _HTTPServer((listen, port), self._handler())
+        if cert:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(cert, key)
+            self._httpd.socket = context.wrap_socket(
+                self._httpd.socket, server_side=True
+            )
+
+    @property
+    def address(self):
+        return self._httpd.server_address
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                status = server.check(self.path, self.headers)
+                if status is None:
+                    length = int(self.headers["Content-Length"])
+                    status = server.handle(self.rfile.read(length))
+                else:
+                    # the body is not read, so the connection can not be
+                    # reused
+                    self.close_connection = True
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def check(self, path, headers):
+        # everything is checked from headers before the body is read
+        if path != self.path:
+            return 404
+        token = (headers.get(self.SECRET_HEADER) or "").encode()
+        if not hmac.compare_digest(token, self._secret.encode()):
+            with self._lock:
+                self.rejected += 1
+            return 403
+        try:
+            length = int(headers.get("Content-Length", ""))
+        except ValueError:
+            return 400
+        if length < 0:
+            return 400
+        if length > self.MAX_BODY_SIZE:
+            return 413
+        return None
+
+    def handle(self, body):
+        try:
+            data = json.loads(body)
+            if not isinstance(data, dict):
+                return 400
+            update = Update.de_json(data, self.dispatcher.bot)
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return 400
+
+        # a full queue answers 503, telegram keeps the update and retries
+        # it later instead of the process buffering without bound
+        try:
+            self.dispatcher.update_queue.put_nowait(update)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return 503
+        with self._lock:
+            self.received += 1
+        return 200
+
+    def start(self):
+        ready = threading.Event()
+        for target, kwargs in (
+            (self.dispatcher.start, {"ready": ready}),
+            (self._httpd.serve_forever, {}),
+        ):
+            thread = threading.Thread(target=target, kwargs=kwargs)
+            thread.start()
+            self._threads.append(thread)
+        if self.dispatcher.job_queue:
+            self.dispatcher.job_queue.start()
+        ready.wait()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self.dispatcher.job_queue:
+            self.dispatcher.job_queue.stop()
+        self.dispatcher.stop()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def serve(self, url, drop_pending_updates=False):
+        self.dispatcher.bot.set_webhook(
+            url,
+            api_kwargs={"secret_token": self._secret},
+            drop_pending_updates=drop_pending_updates,
+        )
+        self.start()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: self._stopped.set())
+        self._stopped.wait()
+        self.stop()
+
+    def stats(self):
+        update_queue = self.dispatcher.update_queue
+        with self._lock:
+            return {
+                "received": self.received,
+                "rejected": self.rejected,
+                "dropped": self.dropped,
+                "queue_size": update_queue.qsize(),
+                "queue_max_size": update_queue.maxsize,
+            }